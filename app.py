@@ -2,19 +2,62 @@
 
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import pandas as pd
+import numpy as np
 from datetime import datetime
-import plotly.express as px
-import plotly.graph_objects as go
 from pathlib import Path
 import io
 import os
+import re
 import uuid
+from bisect import bisect_right
 import asyncio
 import sys
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 
+# orjson is optional; fall back to the stdlib encoder
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# plotly is only needed for charts; pages still render without it.
+# plotly.express is imported where it is used: it is slow to load and only the dashboard needs it.
+try:
+    import plotly.graph_objects as go
+    HAS_PLOTLY = True
+except ImportError:
+    go = None
+    HAS_PLOTLY = False
+
+if HAS_PLOTLY:
+    import plotly.io as pio
+    # st.plotly_chart serializes through plotly.io; let it use orjson when present
+    if HAS_ORJSON:
+        pio.json.config.default_engine = "orjson"
+    # Shared chart defaults, layered over the active (Streamlit) template and resolved once at import
+    pio.templates["edi_compact"] = go.layout.Template(layout={
+        'height': 300,
+        'showlegend': False,
+        'margin': {'l': 20, 'r': 20, 't': 40, 'b': 20},
+        'xaxis': {'automargin': True},  # tight margins: let axis titles claim the room they need
+        'yaxis': {'automargin': True}
+    })
+    CHART_TEMPLATE = pio.templates[f"{pio.templates.default}+edi_compact"]
+
+# Client-side auto-refresh for the dashboard (optional component)
+try:
+    from streamlit_autorefresh import st_autorefresh
+    HAS_AUTOREFRESH = True
+except ImportError:
+    HAS_AUTOREFRESH = False
+
 # Add app directory to path for imports
 if './app' not in sys.path:
     sys.path.insert(0, './app')
@@ -24,7 +67,7 @@ try:
     from app.core.edi_parser import EDI278Parser, EDI278Validator
     from app.core.fhir_mapper import X12To278FHIRMapper, ProductionFHIRMapper
     from app.core.models import EDIFileUpload, ProcessingJob, ValidationResult, AIAnalysis, FHIRMapping
-    from app.ai.analyzer import EDIAIAnalyzer
+    from app.ai.analyzer import get_analyzer
     from app.services.processor import EDIProcessingService, ProductionEDIProcessingService
     from app.config import settings
     HAS_LOCAL_PROCESSING = True
@@ -50,22 +93,100 @@ st.set_page_config(
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
 SUPPORTED_FORMATS = [".edi", ".txt", ".x12"]
 
+# Shared HTTP session: keeps connections to the API alive across calls
+SESSION = requests.Session()
+SESSION.mount(API_BASE_URL, HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=1))
+
+# Explicit dtypes for the validation issues table (avoids object-dtype inference)
+ISSUE_SCHEMA = {
+    'level': 'category',
+    'code': 'string',
+    'message': 'string',
+    'segment': 'category',
+    'line_number': 'Int32',
+    'suggested_fix': 'string'
+}
+SEVERITY_ORDER = ['CRITICAL', 'ERROR', 'WARNING', 'INFO']
+ISSUE_COLUMNS = ('level', 'message', 'segment', 'line_number', 'suggested_fix')
+JOB_COLUMNS = ('job_id', 'filename', 'status', 'created_at', 'processing_time', 'file_size')
+JOB_STATUS_FILTERS = ("All", "completed", "failed", "processing", "pending")
+SEGMENT_CHART_LIMIT = 25  # plotly has no WebGL bar trace; bound the SVG bar count instead
+SEVERITY_COLORS = {
+    'CRITICAL': '#dc3545',  # Red
+    'ERROR': '#fd7e14',  # Orange
+    'WARNING': '#ffc107'  # Yellow
+}
+SEVERITY_STYLES = {
+    'CRITICAL': 'background-color: #ff8888',
+    'ERROR': 'background-color: #ffaaaa',
+    'WARNING': 'background-color: #ffffdd'
+}
+
 # Check deployment mode
 IS_STREAMLIT_CLOUD = ("streamlit.io" in os.getenv("STREAMLIT_SERVER_ADDRESS", "") or 
                       "streamlit.app" in os.getenv("STREAMLIT_SERVER_ADDRESS", "") or
                       not os.getenv("API_BASE_URL"))
 
+# Scope widget reruns to a fragment where supported (Streamlit >= 1.33)
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", lambda func: func)
+
+# Download buttons accept a callable payload, built only on click (newer Streamlit)
+try:
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    LAZY_DOWNLOADS = hasattr(MediaFileManager, "add_deferred")
+except ImportError:
+    LAZY_DOWNLOADS = False
+
+# Per-type cache of dict converters (None = plain object, use getattr)
+_DICT_ADAPTERS = {}
+
+
+def _identity(obj):
+    """Dicts are already in the shape the display code expects."""
+    return obj
+
+
+def _pick_adapter(obj_type):
+    """Return the cached dict converter for a type, resolving it on first use."""
+    try:
+        return _DICT_ADAPTERS[obj_type]
+    except KeyError:
+        pass
+    
+    if issubclass(obj_type, dict):
+        adapter = _identity
+    elif hasattr(obj_type, 'model_dump'):
+        adapter = obj_type.model_dump
+    elif hasattr(obj_type, 'dict'):
+        adapter = obj_type.dict
+    else:
+        adapter = None
+    
+    _DICT_ADAPTERS[obj_type] = adapter
+    return adapter
+
+
+def lazy_data(builder):
+    """Pass a download payload builder through, or call it if deferral is unsupported."""
+    return builder if LAZY_DOWNLOADS else builder()
+
+
+def dumps_json(obj):
+    """Serialize to indented JSON bytes, using orjson when it is installed."""
+    if HAS_ORJSON:
+        return orjson.dumps(
+            obj,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+            default=str
+        )
+    return json.dumps(obj, indent=2, default=str).encode("utf-8")
+
+
 # Helper function for Pydantic v2 compatibility
 def safe_model_dump(obj):
     """Safely convert Pydantic object to dict using model_dump or dict method."""
-    if hasattr(obj, 'model_dump'):
-        return obj.model_dump()
-    elif hasattr(obj, 'dict'):
-        return obj.dict()
-    elif isinstance(obj, dict):
-        return obj
-    else:
-        return obj
+    to_dict = _pick_adapter(type(obj))
+    return to_dict(obj) if to_dict is not None else obj
 
 # Initialize processing service for cloud mode - USE PRODUCTION SERVICE
 if IS_STREAMLIT_CLOUD and HAS_LOCAL_PROCESSING:
@@ -166,19 +287,25 @@ def main():
         show_settings_page()
 
 
+@st.cache_data(ttl=10, show_spinner=False)
+def _cached_health(url):
+    """Query {url}/health; reruns within 10 seconds share one response."""
+    try:
+        response = SESSION.get(f"{url}/health", timeout=5)
+        if response.status_code == 200:
+            return {"healthy": True, "reachable": True, "data": response.json()}
+        else:
+            return {"healthy": False, "reachable": True, "error": f"HTTP {response.status_code}"}
+    except Exception as e:
+        return {"healthy": False, "reachable": False, "error": str(e)}
+
+
 def check_api_health():
     """Check if the API is healthy."""
     if IS_STREAMLIT_CLOUD:
         return {"healthy": True, "mode": "embedded"}
     
-    try:
-        response = requests.get(f"{API_BASE_URL}/health", timeout=5)
-        if response.status_code == 200:
-            return {"healthy": True, "data": response.json()}
-        else:
-            return {"healthy": False, "error": f"HTTP {response.status_code}"}
-    except Exception as e:
-        return {"healthy": False, "error": str(e)}
+    return _cached_health(API_BASE_URL)
 
 
 def show_home_page():
@@ -309,8 +436,7 @@ def show_upload_page():
     st.markdown("Test the system with sample EDI content")
     
     if st.button("Process Demo File"):
-        demo_content = generate_sample_edi()
-        process_demo_content(demo_content, validate_only, enable_ai_analysis, output_format)
+        process_demo_content(SAMPLE_EDI_278, validate_only, enable_ai_analysis, output_format)
 
 
 def process_uploaded_file_sync(uploaded_file, validate_only, enable_ai_analysis, output_format, options=None):
@@ -378,13 +504,17 @@ def process_with_embedded_service_sync(content, filename, validate_only, enable_
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
         
-        # Process content
-        job = loop.run_until_complete(processor.process_content(content, upload_request))
+        # Process content; the Groq client opened for this loop is closed before returning
+        async def process_async():
+            try:
+                return await processor.process_content(content, upload_request)
+            finally:
+                await processor.ai_analyzer.aclose()
+        
+        job = loop.run_until_complete(process_async())
         
         # Store job in session state for later retrieval
-        if 'jobs' not in st.session_state:
-            st.session_state['jobs'] = {}
-        st.session_state['jobs'][job.job_id] = job
+        record_job(job)
         
         # Return the actual job object, not a dict
         return job
@@ -407,7 +537,7 @@ def process_with_api_sync(content, filename, validate_only, enable_ai_analysis,
         }
         
         # Call API
-        response = requests.post(f"{API_BASE_URL}/process", json=data)
+        response = SESSION.post(f"{API_BASE_URL}/process", json=data)
         
         if response.status_code == 200:
             return response.json()
@@ -463,9 +593,7 @@ async def process_with_embedded_service(content, filename, validate_only, enable
         job = await processing_service.process_content(content, upload_request)
         
         # Store job in session state for later retrieval
-        if 'jobs' not in st.session_state:
-            st.session_state['jobs'] = {}
-        st.session_state['jobs'][job.job_id] = job
+        record_job(job)
         
         # Return the actual job object, not a dict
         return job
@@ -475,6 +603,46 @@ async def process_with_embedded_service(content, filename, validate_only, enable
         return None
 
 
+def _job_is_valid(job):
+    """Whether a job's validation result (dict or object) reports a valid document."""
+    validation_result = getattr(job, 'validation_result', None)
+    if not validation_result:
+        return False
+    if isinstance(validation_result, dict):
+        return bool(validation_result.get('is_valid', False))
+    return bool(getattr(validation_result, 'is_valid', False))
+
+
+def _build_jobs_soa(jobs):
+    """Column arrays of job status, validity and processing time for vectorized stats."""
+    statuses, valids, times = [], [], []
+    for job in jobs:
+        status = getattr(job, 'status', 'unknown')
+        statuses.append(getattr(status, 'value', status))
+        valids.append(_job_is_valid(job))
+        times.append(getattr(job, 'processing_time', None) or np.nan)
+    return {
+        'status': np.array(statuses, dtype='U16'),
+        'is_valid': np.array(valids, dtype=bool),
+        'processing_time': np.array(times, dtype=float)
+    }
+
+
+def record_job(job):
+    """Store a job in session state and keep the jobs_soa arrays in step."""
+    jobs = st.session_state.setdefault('jobs', {})
+    is_new = job.job_id not in jobs
+    jobs[job.job_id] = job
+    
+    soa = st.session_state.get('jobs_soa')
+    if is_new and soa is not None:
+        row = _build_jobs_soa([job])
+        st.session_state['jobs_soa'] = {key: np.concatenate((soa[key], row[key])) for key in soa}
+    else:
+        # First job, or a job was replaced in place: rebuild from the registry
+        st.session_state['jobs_soa'] = _build_jobs_soa(jobs.values())
+
+
 def display_processing_results(result, filename):
     """Display comprehensive processing results with all advanced features."""
     
@@ -530,7 +698,7 @@ def display_processing_results(result, filename):
         else:
             # Get from API
             try:
-                job_response = requests.get(f"{API_BASE_URL}/jobs/{job_id}")
+                job_response = SESSION.get(f"{API_BASE_URL}/jobs/{job_id}")
                 if job_response.status_code == 200:
                     job_details = job_response.json()
             except Exception as e:
@@ -685,8 +853,8 @@ def display_processing_results(result, filename):
         
         # Check if AI should be available
         try:
-            from app.ai.analyzer import EDIAIAnalyzer
-            analyzer = EDIAIAnalyzer()
+            from app.ai.analyzer import get_analyzer
+            analyzer = get_analyzer()
             if analyzer.is_available:
                 st.warning("🤖 AI analysis was enabled but failed during processing. This may be due to API rate limits or temporary service issues.")
                 st.info("💡 **Tip**: AI analysis provides additional insights about document quality, anomalies, and improvement suggestions.")
@@ -762,10 +930,9 @@ def display_validation_section(validation_result, job_id):
     st.subheader("Validation Results")
     
     # Extract validation data with error handling
-    if hasattr(validation_result, 'model_dump') or hasattr(validation_result, 'dict'):
-        val_data = safe_model_dump(validation_result)
-    elif isinstance(validation_result, dict):
-        val_data = validation_result
+    to_dict = _pick_adapter(type(validation_result))
+    if to_dict is not None:
+        val_data = to_dict(validation_result)
     else:
         val_data = {
             'is_valid': getattr(validation_result, 'is_valid', False),
@@ -822,119 +989,136 @@ def display_validation_section(validation_result, job_id):
         
         # Add validation charts
         st.subheader("📊 Validation Analytics")
-        create_validation_charts({'issues': issues}, 'validation_job')
+        create_validation_charts({'issues': issues}, job_id)
         
         # Convert issues to DataFrame
-        if issues and (hasattr(issues[0], 'model_dump') or hasattr(issues[0], 'dict')):
-            issues_data = [safe_model_dump(issue) for issue in issues]
+        issue_to_dict = _pick_adapter(type(issues[0]))
+        if issue_to_dict is not None and issue_to_dict is not _identity:
+            issues_data = [issue_to_dict(issue) for issue in issues]
         else:
             issues_data = issues
         
-        issues_df = pd.DataFrame(issues_data)
-        
-        # Ensure required columns exist
-        required_columns = ['level', 'code', 'message', 'segment', 'line_number', 'suggested_fix']
-        for col in required_columns:
-            if col not in issues_df.columns:
-                issues_df[col] = 'N/A'
-        
-        # Filter controls
-        col_filter1, col_filter2 = st.columns(2)
-        
-        with col_filter1:
-            level_options = issues_df['level'].unique()
-            level_filter = st.multiselect(
-                "Filter by Severity",
-                options=level_options,
-                default=level_options,
-                key=f"level_filter_{job_id}"
-            )
-        
-        with col_filter2:
-            segment_options = issues_df['segment'].unique()
-            segment_filter = st.multiselect(
-                "Filter by Segment",
-                options=segment_options,
-                default=segment_options,
-                key=f"segment_filter_{job_id}"
-            )
+        # Build with an explicit schema - missing columns become typed nulls
+        issues_df = (
+            pd.DataFrame.from_records(issues_data, columns=list(ISSUE_SCHEMA))
+            .fillna({'segment': 'N/A'})
+            .astype(ISSUE_SCHEMA)
+        )
         
-        # Apply filters
-        filtered_df = issues_df[
-            (issues_df['level'].isin(level_filter)) &
-            (issues_df['segment'].isin(segment_filter))
-        ]
+        # Order severities and pre-sort server-side so the table arrives sorted
+        levels = issues_df['level'].str.upper()
+        extra_levels = sorted(set(levels.dropna()) - set(SEVERITY_ORDER))
+        issues_df['level'] = pd.Categorical(
+            levels, categories=SEVERITY_ORDER + extra_levels, ordered=True
+        ).remove_unused_categories()
+        issues_df.sort_values(['level', 'segment', 'line_number'], inplace=True, kind='mergesort')
         
-        if not filtered_df.empty:
-            # Display issues with proper styling
-            for idx, row in filtered_df.iterrows():
-                level = row['level'].upper()
-                message = row['message']
-                segment = row['segment']
-                line_num = row['line_number']
-                suggested_fix = row['suggested_fix']
-                
-                if level == 'CRITICAL':
-                    st.error(f"🚨 **CRITICAL:** {message}")
-                elif level == 'ERROR':
-                    st.error(f"❌ **ERROR:** {message}")
-                elif level == 'WARNING':
-                    st.warning(f"⚠️ **WARNING:** {message}")
-                else:
-                    st.info(f"ℹ️ **{level}:** {message}")
-                
-                # Show additional details
-                if segment and segment != 'N/A':
-                    st.caption(f"Segment: {segment}")
-                if line_num and line_num != 'N/A':
-                    st.caption(f"Line: {line_num}")
-                if suggested_fix and suggested_fix != 'N/A':
-                    st.caption(f"Suggested Fix: {suggested_fix}")
-                
-                st.divider()
-            
-            # Add table view option
-            st.subheader("📊 Table View")
-            
-            # Create a clean display dataframe
-            display_df = filtered_df[['level', 'message', 'segment', 'line_number', 'suggested_fix']].copy()
-            
-            # Add severity icons
-            def add_severity_icon(level):
-                if level.upper() == 'CRITICAL':
-                    return f"🚨 {level}"
-                elif level.upper() == 'ERROR':
-                    return f"❌ {level}"
-                elif level.upper() == 'WARNING':
-                    return f"⚠️ {level}"
-                else:
-                    return f"ℹ️ {level}"
+        _render_issues(issues_df, job_id)
+    else:
+        st.success("No validation issues found! Document is fully compliant.")
+
+
+@fragment
+def _render_issues(issues_df, job_id):
+    """Render the filterable issues list and table; filter changes rerun only this fragment."""
+    # Filter controls
+    col_filter1, col_filter2 = st.columns(2)
+    
+    # Options come straight from the precomputed (already ordered) categories;
+    # small hashable tuples keep Streamlit's widget-identity hashing O(#categories)
+    level_options = tuple(issues_df['level'].cat.categories.to_list())
+    segment_options = tuple(issues_df['segment'].cat.categories.to_list())
+    
+    with col_filter1:
+        level_filter = st.multiselect(
+            "Filter by Severity",
+            options=level_options,
+            default=level_options,
+            key=f"level_filter_{job_id}"
+        )
+    
+    with col_filter2:
+        segment_filter = st.multiselect(
+            "Filter by Segment",
+            options=segment_options,
+            default=segment_options,
+            key=f"segment_filter_{job_id}"
+        )
+    
+    # Apply filters
+    filtered_df = issues_df[
+        (issues_df['level'].isin(level_filter)) &
+        (issues_df['segment'].isin(segment_filter))
+    ]
+    
+    if not filtered_df.empty:
+        # Display issues with proper styling
+        for idx, row in filtered_df.iterrows():
+            level = row['level'].upper()
+            message = row['message']
+            segment = row['segment']
+            line_num = row['line_number']
+            suggested_fix = row['suggested_fix']
             
-            display_df['Severity'] = display_df['level'].apply(add_severity_icon)
-            display_df['Message'] = display_df['message']
-            display_df['Segment'] = display_df['segment']
-            display_df['Line'] = display_df['line_number']
-            display_df['Suggested Fix'] = display_df['suggested_fix']
+            if level == 'CRITICAL':
+                st.error(f"🚨 **CRITICAL:** {message}")
+            elif level == 'ERROR':
+                st.error(f"❌ **ERROR:** {message}")
+            elif level == 'WARNING':
+                st.warning(f"⚠️ **WARNING:** {message}")
+            else:
+                st.info(f"ℹ️ **{level}:** {message}")
             
-            # Select only the formatted columns
-            table_df = display_df[['Severity', 'Message', 'Segment', 'Line', 'Suggested Fix']]
+            # Show additional details
+            if segment and segment != 'N/A':
+                st.caption(f"Segment: {segment}")
+            if pd.notna(line_num):
+                st.caption(f"Line: {line_num}")
+            if pd.notna(suggested_fix) and suggested_fix:
+                st.caption(f"Suggested Fix: {suggested_fix}")
             
-            st.dataframe(
-                table_df,
-                use_container_width=True,
-                hide_index=True,
-                column_config={
-                    "Severity": st.column_config.TextColumn(width="small"),
-                    "Message": st.column_config.TextColumn(width="large"),
-                    "Segment": st.column_config.TextColumn(width="small"),
-                    "Line": st.column_config.NumberColumn(width="small"),
-                    "Suggested Fix": st.column_config.TextColumn(width="large")
-                }
-            )
-        else:
-            st.info("No issues match the selected filters.")
+            st.divider()
+        
+        # Add table view option
+        st.subheader("📊 Table View")
+        
+        # Create a clean display dataframe
+        display_df = filtered_df[list(ISSUE_COLUMNS)].copy()
+        
+        # Add severity icons
+        def add_severity_icon(level):
+            if level.upper() == 'CRITICAL':
+                return f"🚨 {level}"
+            elif level.upper() == 'ERROR':
+                return f"❌ {level}"
+            elif level.upper() == 'WARNING':
+                return f"⚠️ {level}"
+            else:
+                return f"ℹ️ {level}"
+        
+        display_df['Severity'] = display_df['level'].apply(add_severity_icon)
+        display_df['Message'] = display_df['message']
+        display_df['Segment'] = display_df['segment']
+        display_df['Line'] = display_df['line_number']
+        display_df['Suggested Fix'] = display_df['suggested_fix']
+        
+        # Select only the formatted columns
+        table_df = display_df[['Severity', 'Message', 'Segment', 'Line', 'Suggested Fix']]
+        
+        st.dataframe(
+            table_df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Severity": st.column_config.TextColumn(width="small"),
+                "Message": st.column_config.TextColumn(width="large"),
+                "Segment": st.column_config.TextColumn(width="small"),
+                "Line": st.column_config.NumberColumn(width="small"),
+                "Suggested Fix": st.column_config.TextColumn(width="large")
+            }
+        )
     else:
-        st.success("No validation issues found! Document is fully compliant.")
+        st.info("No issues match the selected filters.")
 
 
 def display_ai_analysis_section(ai_analysis):
@@ -942,10 +1126,9 @@ def display_ai_analysis_section(ai_analysis):
     st.subheader("🤖 AI Analysis & Insights")
     
     # Extract AI data
-    if hasattr(ai_analysis, 'dict'):
-        ai_data = ai_analysis.dict()
-    elif isinstance(ai_analysis, dict):
-        ai_data = ai_analysis
+    to_dict = _pick_adapter(type(ai_analysis))
+    if to_dict is not None:
+        ai_data = to_dict(ai_analysis)
     else:
         ai_data = {
             'confidence_score': getattr(ai_analysis, 'confidence_score', 0),
@@ -1057,10 +1240,9 @@ def display_fhir_section(fhir_mapping):
     st.subheader("FHIR Mapping Results")
     
     # Extract FHIR data
-    if hasattr(fhir_mapping, 'dict'):
-        fhir_data = fhir_mapping.dict()
-    elif isinstance(fhir_mapping, dict):
-        fhir_data = fhir_mapping
+    to_dict = _pick_adapter(type(fhir_mapping))
+    if to_dict is not None:
+        fhir_data = to_dict(fhir_mapping)
     else:
         fhir_data = {
             'resources': getattr(fhir_mapping, 'resources', []),
@@ -1069,19 +1251,16 @@ def display_fhir_section(fhir_mapping):
     
     resources = fhir_data.get('resources', [])
     
+    # Dump model resources once so the summary and detail views share the dicts
+    if resources and hasattr(resources[0], 'model_fields'):
+        from pydantic import TypeAdapter
+        resources = TypeAdapter(List[type(resources[0])]).dump_python(resources)
+    
     if resources:
         st.success(f"Successfully mapped to {len(resources)} FHIR resources")
         
         # Resource summary
-        resource_types = {}
-        for resource in resources:
-            if hasattr(resource, 'dict'):
-                res_data = resource.dict()
-            else:
-                res_data = resource
-            
-            res_type = res_data.get('resource_type', 'Unknown')
-            resource_types[res_type] = resource_types.get(res_type, 0) + 1
+        resource_types = Counter(res.get('resource_type', 'Unknown') for res in resources)
         
         # Display resource counts
         cols = st.columns(len(resource_types))
@@ -1091,12 +1270,7 @@ def display_fhir_section(fhir_mapping):
         
         # Detailed resource view
         with st.expander("🔍 View FHIR Resources"):
-            for i, resource in enumerate(resources):
-                if hasattr(resource, 'dict'):
-                    res_data = resource.dict()
-                else:
-                    res_data = resource
-                
+            for res_data in resources:
                 st.subheader(f"{res_data.get('resource_type', 'Unknown')} Resource")
                 st.json(res_data.get('data', {}))
     else:
@@ -1133,26 +1307,28 @@ def display_download_section(job_id, filename, job_details):
         parsed_edi = getattr(job_details, 'parsed_edi', None)
         validation_result = getattr(job_details, 'validation_result', None)
     
+    # API mode: fetch every export format concurrently (cached per job)
+    exports = {} if IS_STREAMLIT_CLOUD else fetch_exports(job_id)
+    
     # JSON Download
     with col1:
         try:
             if IS_STREAMLIT_CLOUD:
-                # Generate JSON from job details
-                json_content = json.dumps(job_dict, indent=2, default=str)
+                # Generate JSON from job details on click
                 st.download_button(
                     "JSON",
-                    json_content,
+                    lazy_data(lambda: dumps_json(job_dict)),
                     f"result_{filename}.json",
                     "application/json",
                     key=f"json_{job_id}",
                     help="Download complete processing results as JSON"
                 )
             else:
-                response = requests.get(f"{API_BASE_URL}/jobs/{job_id}/export/json")
-                if response.status_code == 200:
+                content = exports.get('json')
+                if content is not None:
                     st.download_button(
                         "JSON",
-                        response.text,
+                        content,
                         f"result_{filename}.json",
                         "application/json",
                         key=f"json_{job_id}",
@@ -1168,22 +1344,21 @@ def display_download_section(job_id, filename, job_details):
         try:
             if fhir_mapping:
                 if IS_STREAMLIT_CLOUD:
-                    # Generate FHIR JSON from mapping
-                    fhir_content = json.dumps(safe_model_dump(fhir_mapping), indent=2, default=str)
+                    # Generate FHIR JSON from mapping on click
                     st.download_button(
                         "FHIR",
-                        fhir_content,
+                        lazy_data(lambda: dumps_json(safe_model_dump(fhir_mapping))),
                         f"fhir_{filename}.json",
                         "application/fhir+json",
                         key=f"fhir_{job_id}",
                         help="Download FHIR resources as JSON"
                     )
                 else:
-                    response = requests.get(f"{API_BASE_URL}/jobs/{job_id}/export/xml")
-                    if response.status_code == 200:
+                    content = exports.get('xml')
+                    if content is not None:
                         st.download_button(
                             "FHIR",
-                            response.text,
+                            content,
                             f"fhir_{filename}.xml",
                             "application/fhir+xml",
                             key=f"fhir_{job_id}",
@@ -1218,11 +1393,11 @@ def display_download_section(job_id, filename, job_details):
                         help="Download original EDI content"
                     )
                 else:
-                    response = requests.get(f"{API_BASE_URL}/jobs/{job_id}/export/edi")
-                    if response.status_code == 200:
+                    content = exports.get('edi')
+                    if content is not None:
                         st.download_button(
                             "EDI",
-                            response.text,
+                            content,
                             f"processed_{filename}",
                             "text/plain",
                             key=f"edi_{job_id}",
@@ -1240,22 +1415,23 @@ def display_download_section(job_id, filename, job_details):
         try:
             if validation_result:
                 if IS_STREAMLIT_CLOUD:
-                    # Generate validation report
-                    report_content = generate_validation_report(validation_result, filename)
+                    # Generate validation report on click
                     st.download_button(
                         "Report",
-                        report_content,
+                        lazy_data(lambda: cached_validation_report(
+                            job_id, filename, validation_report_key(validation_result), validation_result
+                        )),
                         f"validation_{filename}.txt",
                         "text/plain",
                         key=f"report_{job_id}",
                         help="Download validation report"
                     )
                 else:
-                    response = requests.get(f"{API_BASE_URL}/jobs/{job_id}/export/validation")
-                    if response.status_code == 200:
+                    content = exports.get('validation')
+                    if content is not None:
                         st.download_button(
                             "Report",
-                            response.text,
+                            content,
                             f"validation_{filename}.json",
                             "application/json",
                             key=f"report_{job_id}",
@@ -1283,8 +1459,43 @@ def display_download_section(job_id, filename, job_details):
     st.info("All downloads are formatted for easy import into other healthcare systems.")
 
 
+def cached_validation_report(job_id, filename, validation_key, _validation_result):
+    """Validation report for a job, stamped with the current time over a body built once per job."""
+    return _report_generated_line() + _cached_validation_report_body(job_id, filename, validation_key, _validation_result)
+
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def _cached_validation_report_body(job_id, filename, validation_key, _validation_result):
+    """Report body below the Generated: line, built once per job; the result object itself is not hashed."""
+    return _validation_report_body(_validation_result, filename)
+
+
+def validation_report_key(validation_result):
+    """Cheap fingerprint of a validation result for report caching."""
+    if isinstance(validation_result, dict):
+        return (validation_result.get('is_valid', False),
+                validation_result.get('segments_validated', 0),
+                len(validation_result.get('issues') or []))
+    return (getattr(validation_result, 'is_valid', False),
+            getattr(validation_result, 'segments_validated', 0),
+            len(getattr(validation_result, 'issues', None) or []))
+
+
+def _report_generated_line():
+    """Title and Generated: lines of the validation report, for the current time."""
+    return f"""
+EDI X12 278 VALIDATION REPORT
+Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+"""
+
+
 def generate_validation_report(validation_result, filename):
     """Generate a comprehensive validation report."""
+    return _report_generated_line() + _validation_report_body(validation_result, filename)
+
+
+def _validation_report_body(validation_result, filename):
+    """Everything in the validation report below the Generated: line; must not depend on the clock."""
     
     # Handle both dict and object access patterns
     if isinstance(validation_result, dict):
@@ -1302,10 +1513,8 @@ def generate_validation_report(validation_result, filename):
         issues = getattr(validation_result, 'issues', [])
         suggested_improvements = getattr(validation_result, 'suggested_improvements', [])
     
-    report = f"""
-EDI X12 278 VALIDATION REPORT
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-File: {filename}
+    report = io.StringIO()
+    report.write(f"""File: {filename}
 
 VALIDATION SUMMARY
 - Valid: {is_valid}
@@ -1313,10 +1522,10 @@ VALIDATION SUMMARY
 - Segments Validated: {segments_validated}
 - Validation Time: {validation_time:.3f}s
 
-"""
+""")
     
     if issues:
-        report += f"ISSUES FOUND ({len(issues)}):\n"
+        report.write(f"ISSUES FOUND ({len(issues)}):\n")
         for i, issue in enumerate(issues, 1):
             # Handle both dict and object access for issues
             if isinstance(issue, dict):
@@ -1330,19 +1539,18 @@ VALIDATION SUMMARY
                 segment = getattr(issue, 'segment', None)
                 suggested_fix = getattr(issue, 'suggested_fix', None)
                 
-            report += f"{i}. [{level}] {message}\n"
+            report.write(f"{i}. [{level}] {message}\n")
             if segment:
-                report += f"   Segment: {segment}\n"
+                report.write(f"   Segment: {segment}\n")
             if suggested_fix:
-                report += f"   Fix: {suggested_fix}\n"
-            report += "\n"
+                report.write(f"   Fix: {suggested_fix}\n")
+            report.write("\n")
     
     if suggested_improvements:
-        report += "RECOMMENDATIONS:\n"
-        for i, suggestion in enumerate(suggested_improvements, 1):
-            report += f"{i}. {suggestion}\n"
+        report.write("RECOMMENDATIONS:\n")
+        report.writelines(f"{i}. {suggestion}\n" for i, suggestion in enumerate(suggested_improvements, 1))
     
-    return report
+    return report.getvalue()
 
 
 def show_validation_page():
@@ -1410,7 +1618,7 @@ def validate_edi_content(content, options):
                     "enable_ai_analysis": options.get('enable_ai_analysis', True)
                 }
                 
-                response = requests.post(f"{API_BASE_URL}/validate", json=payload)
+                response = SESSION.post(f"{API_BASE_URL}/validate", json=payload)
                 
                 if response.status_code == 200:
                     result = response.json()
@@ -1454,6 +1662,9 @@ def validate_with_embedded_service(content, options):
             except Exception as e:
                 logger.error(f"Production validation failed: {str(e)}")
                 raise
+            finally:
+                # asyncio.run and the worker thread's loop end here; close the Groq client opened for it
+                await processor.ai_analyzer.aclose()
         
         # Run async validation
         import asyncio
@@ -1487,92 +1698,134 @@ def validate_with_embedded_service(content, options):
 
 def display_enhanced_validation_results(result, options):
     """Display enhanced validation results with all features."""
+    _render_validation(result, detailed=True, options=options)
+
+
+def _issue_frame(issues, default_level):
+    """Issues as one DataFrame with upper-cased levels, shared by both validation views."""
+    issues_df = pd.DataFrame.from_records(
+        issues, columns=list(ISSUE_COLUMNS)
+    )
+    issues_df['level'] = issues_df['level'].fillna(default_level).str.upper()
+    return issues_df
+
+
+@fragment
+def _issues_panel(issues_df):
+    """Filterable issues table; filter changes rerun only this fragment."""
+    # Filter options
+    col1, col2 = st.columns(2)
+    with col1:
+        level_filter = st.selectbox("Filter by Level", _unique_levels(tuple(issues_df['level'])))
+    with col2:
+        show_fixes = st.checkbox("Show Suggested Fixes", value=True)
+    
+    # Display filtered issues
+    filtered_df = issues_df if level_filter == "All" else issues_df[issues_df['level'] == level_filter]
+    if not show_fixes:
+        filtered_df = filtered_df.drop(columns='suggested_fix')
+    
+    styler = filtered_df.style
+    style_map = getattr(styler, 'map', None) or styler.applymap  # pandas < 2.1
+    st.dataframe(
+        style_map(lambda level: SEVERITY_STYLES.get(level, ''), subset=['level']),
+        use_container_width=True,
+        hide_index=True
+    )
+
+
+def _render_validation(result, *, detailed, options=None):
+    """Render validation results; detailed adds analytics, filters, AI analysis and exports."""
+    options = options or {}
     
     if not result:
-        st.error("No validation results to display")
+        st.error("No validation results to display" if detailed else "No validation results available")
         return
     
-    # Main validation status - FIXED to properly handle failures
+    # Read every field once up front
     is_valid = result.get("is_valid", False)
     tr3_compliance = result.get("tr3_compliance", False)
+    segments = result.get("segments_validated", 0)
+    time_taken = result.get("validation_time", 0)
     issues = result.get("issues", [])
+    ai_analysis = result.get("ai_analysis")
     
-    # Count critical and error issues
-    critical_issues = [i for i in issues if i.get("level", "").upper() == "CRITICAL"]
-    error_issues = [i for i in issues if i.get("level", "").upper() == "ERROR"]
-    
-    if not is_valid or not tr3_compliance or critical_issues:
-        st.error("🚫 VALIDATION FAILED - Document has critical issues requiring attention")
-        if critical_issues:
-            st.error(f"Found {len(critical_issues)} critical issue(s) that block TR3 compliance")
-        if error_issues:
-            st.warning(f"Found {len(error_issues)} error(s) that affect document quality")
-    elif error_issues:
-        st.warning("⚠️ VALIDATION PASSED WITH WARNINGS - Document has minor issues")
+    if detailed:
+        # Main validation status - FIXED to properly handle failures
+        # Count critical and error issues in a single pass
+        level_counts = Counter(i.get("level", "").upper() for i in issues)
+        critical_count, error_count = level_counts["CRITICAL"], level_counts["ERROR"]
+        
+        if not is_valid or not tr3_compliance or critical_count:
+            st.error("🚫 VALIDATION FAILED - Document has critical issues requiring attention")
+            if critical_count:
+                st.error(f"Found {critical_count} critical issue(s) that block TR3 compliance")
+            if error_count:
+                st.warning(f"Found {error_count} error(s) that affect document quality")
+        elif error_count:
+            st.warning("⚠️ VALIDATION PASSED WITH WARNINGS - Document has minor issues")
+        else:
+            st.success("✅ VALIDATION PASSED - Document is valid and compliant")
+        
+        # Key metrics
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Document Status", "✅ VALID" if is_valid else "❌ INVALID")
+        with col2:
+            st.metric("TR3 Compliance", "✅ PASS" if tr3_compliance else "❌ FAIL")
+        with col3:
+            st.metric("Segments Validated", segments)
+        with col4:
+            st.metric("Validation Time", f"{time_taken:.3f}s")
     else:
-        st.success("✅ VALIDATION PASSED - Document is valid and compliant")
-    
-    # Key metrics
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
+        # Main status
         if is_valid:
-            st.metric("Document Status", "✅ VALID")
-        else:
-            st.metric("Document Status", "❌ INVALID")
-    with col2:
-        if tr3_compliance:
-            st.metric("TR3 Compliance", "✅ PASS")
+            st.success("Document validation completed successfully")
         else:
-            st.metric("TR3 Compliance", "❌ FAIL")
-    with col3:
-        segments = result.get("segments_validated", 0)
-        st.metric("Segments Validated", segments)
-    with col4:
-        time_taken = result.get("validation_time", 0)
-        st.metric("Validation Time", f"{time_taken:.3f}s")
+            st.error("Document validation found issues")
+        
+        # Metrics
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("Status", "VALID" if is_valid else "INVALID")
+        with col2:
+            st.metric("TR3 Compliance", "PASS" if tr3_compliance else "FAIL")
+        with col3:
+            st.metric("Segments Validated", segments)
     
     # Validation issues
-    if issues:
+    if issues and detailed:
         st.subheader(f"Validation Issues ({len(issues)})")
         
         # Add validation charts
         st.subheader("📊 Validation Analytics")
-        create_validation_charts({'issues': issues}, 'validation_job')
-        
-        # Filter options
-        col1, col2 = st.columns(2)
-        with col1:
-            level_filter = st.selectbox("Filter by Level", ["All"] + list(set([issue.get("level", "unknown") for issue in issues])))
-        with col2:
-            show_fixes = st.checkbox("Show Suggested Fixes", value=True)
+        create_validation_charts({'issues': issues}, 'validation_page')
         
-        # Display filtered issues
-        filtered_issues = issues if level_filter == "All" else [issue for issue in issues if issue.get("level") == level_filter]
+        # One frame for all issues; rendered as a single table instead of a widget per issue
+        _issues_panel(_issue_frame(issues, 'unknown'))
+    elif issues:
+        st.subheader(f"Issues Found ({len(issues)})")
+        issues_df = _issue_frame(issues, 'info')
         
-        for i, issue in enumerate(filtered_issues, 1):
-            level = issue.get("level", "unknown").upper()
-            message = issue.get("message", "Unknown issue")
-            
-            if level == "CRITICAL":
-                st.error(f"🚨 **CRITICAL:** {message}")
-            elif level == "ERROR":
-                st.error(f"❌ **ERROR:** {message}")
-            elif level == "WARNING":
-                st.warning(f"⚠️ **WARNING:** {message}")
-            else:
-                st.info(f"ℹ️ **{level}:** {message}")
-            
-            # Show additional details
-            if issue.get("segment"):
-                st.caption(f"Segment: {issue['segment']}")
-            if issue.get("line_number"):
-                st.caption(f"Line: {issue['line_number']}")
-            if show_fixes and issue.get("suggested_fix"):
-                st.caption(f"Suggested Fix: {issue['suggested_fix']}")
+        # Summary chart by severity, full list on demand
+        st.bar_chart(issues_df['level'].value_counts())
+        with st.expander("Show all issues"):
+            st.dataframe(issues_df, use_container_width=True, hide_index=True)
+    elif not detailed:
+        st.success("No validation issues found")
+    
+    if not detailed:
+        # Suggestions
+        suggestions = result.get("suggested_improvements", [])
+        if suggestions:
+            st.subheader("Recommendations")
+            for suggestion in suggestions:
+                st.info(suggestion)
+        return
     
     # AI Analysis (if available)
-    ai_analysis = result.get("ai_analysis")
     if ai_analysis and options.get('show_details', True):
         display_ai_analysis_section(ai_analysis)
     
@@ -1582,87 +1835,80 @@ def display_enhanced_validation_results(result, options):
         
         col1, col2 = st.columns(2)
         with col1:
-            # JSON export
-            json_data = json.dumps(result, indent=2, default=str)
+            # JSON export, encoded only when downloaded
             st.download_button(
                 "Download JSON Report",
-                json_data,
+                lazy_data(lambda: build_json_report(result)),
                 "validation_report.json",
                 "application/json"
             )
         
         with col2:
-            # Text report
-            text_report = f"""EDI VALIDATION REPORT
+            # Text report, built only when downloaded
+            st.download_button(
+                "Download Text Report", 
+                lazy_data(lambda: build_text_report(result)),
+                "validation_report.txt",
+                "text/plain"
+            )
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def build_json_report(result):
+    """Encode a validation result for download; reruns reuse the cached bytes."""
+    return dumps_json(result)
+
+
+def build_text_report(result):
+    """Render the plain-text validation report as bytes, stamped with the current time."""
+    generated = f"""EDI VALIDATION REPORT
 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+"""
+    return generated.encode("utf-8") + _text_report_body(result)
+
 
+@st.cache_data(ttl=300, show_spinner=False)
+def _text_report_body(result):
+    """Everything in the text report below the Generated: line; cached, so it must not depend on the clock."""
+    issues = result.get("issues", [])
+    header = f"""
 SUMMARY:
-- Status: {'VALID' if is_valid else 'INVALID'}
-- TR3 Compliant: {'YES' if tr3_compliance else 'NO'}
+- Status: {'VALID' if result.get('is_valid', False) else 'INVALID'}
+- TR3 Compliant: {'YES' if result.get('tr3_compliance', False) else 'NO'}
 - Segments: {result.get('segments_validated', 0)}
 - Issues: {len(issues)}
 
 DETAILS:
-{chr(10).join([f"- [{issue.get('level', 'unknown').upper()}] {issue.get('message', 'Unknown')}" for issue in issues])}
 """
-            
-            st.download_button(
-                "Download Text Report", 
-                text_report,
-                "validation_report.txt",
-                "text/plain"
-            )
+    buf = io.StringIO()
+    buf.write(header)
+    buf.writelines(
+        f"- [{issue.get('level', 'unknown').upper()}] {issue.get('message', 'Unknown')}\n" for issue in issues
+    )
+    return buf.getvalue().encode("utf-8")
+
+
+@st.cache_data(show_spinner=False)
+def _unique_levels(levels):
+    """Level filter options, computed once per distinct tuple of issue levels."""
+    return ("All",) + tuple(sorted(set(levels)))
 
 
 def display_validation_results(result):
     """Display validation results in a clean, professional format.""" 
-    
-    if not result:
-        st.error("No validation results available")
-        return
-    
-    # Main status
-    is_valid = result.get("is_valid", False)
-    if is_valid:
-        st.success("Document validation completed successfully")
-    else:
-        st.error("Document validation found issues")
-    
-    # Metrics
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.metric("Status", "VALID" if is_valid else "INVALID")
-    with col2:
-        tr3_compliant = result.get("tr3_compliance", False)
-        st.metric("TR3 Compliance", "PASS" if tr3_compliant else "FAIL")
-    with col3:
-        segments = result.get("segments_validated", 0)
-        st.metric("Segments Validated", segments)
-    
-    # Issues
-    issues = result.get("issues", [])
-    if issues:
-        st.subheader(f"Issues Found ({len(issues)})")
-        for issue in issues:
-            level = issue.get("level", "info").upper()
-            message = issue.get("message", "Unknown issue")
-            
-            if level in ["CRITICAL", "ERROR"]:
-                st.error(f"**{level}:** {message}")
-            elif level == "WARNING":
-                st.warning(f"**{level}:** {message}")
-            else:
-                st.info(f"**{level}:** {message}")
-    else:
-        st.success("No validation issues found")
-    
-    # Suggestions
-    suggestions = result.get("suggested_improvements", [])
-    if suggestions:
-        st.subheader("Recommendations")
-        for suggestion in suggestions:
-            st.info(suggestion)
+    _render_validation(result, detailed=False)
+
+
+STATUS_LABELS = ("Successful", "Failed")
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _status_counts_frame(successful, failed):
+    """Successful/failed counts indexed by status label, for the dashboard charts."""
+    return pd.DataFrame(
+        {"Count": np.array([successful, failed])},
+        index=pd.Index(STATUS_LABELS, name="Status")
+    )
 
 
 def show_dashboard_page():
@@ -1728,31 +1974,22 @@ def show_dashboard_page():
         
         # Success/Failure Chart
         if total_files > 0:
-            chart_data = {
-                "Status": ["Successful", "Failed"],
-                "Count": [successful, failed]
-            }
-            
-            import pandas as pd
-            df = pd.DataFrame(chart_data)
+            status_counts = _status_counts_frame(successful, failed)
             
             col1, col2 = st.columns(2)
             
             with col1:
-                st.bar_chart(df.set_index("Status"))
+                st.bar_chart(status_counts)
             
             with col2:
                 # Create pie chart data
                 if successful > 0 or failed > 0:
-                    sizes = [successful, failed]
-                    labels = ['Successful', 'Failed']
-                    
                     # Use plotly for pie chart
-                    try:
+                    if HAS_PLOTLY:
                         import plotly.express as px
-                        fig = px.pie(values=sizes, names=labels, title="Processing Results")
+                        fig = px.pie(values=status_counts["Count"].to_numpy(), names=STATUS_LABELS, title="Processing Results")
                         st.plotly_chart(fig, use_container_width=True)
-                    except ImportError:
+                    else:
                         # Fallback if plotly not available
                         st.write("**Processing Results:**")
                         st.write(f"- Successful: {successful}")
@@ -1775,47 +2012,14 @@ def show_dashboard_page():
         
         if recent_jobs:
             # Create a simple table of recent jobs
-            job_data = []
-            for job in recent_jobs:
-                if isinstance(job, dict):
-                    created_at = job.get("created_at", "Unknown")
-                    if hasattr(created_at, 'strftime'):
-                        time_str = created_at.strftime("%Y-%m-%d %H:%M")
-                    elif isinstance(created_at, str):
-                        try:
-                            dt = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                            time_str = dt.strftime("%Y-%m-%d %H:%M")
-                        except:
-                            time_str = str(created_at)
-                    else:
-                        time_str = str(created_at)
-                    
-                    job_data.append({
-                        "Job ID": job.get("job_id", "Unknown")[:8] + "...",
-                        "Filename": job.get("filename", "Unknown"),
-                        "Status": job.get("status", "Unknown").upper(),
-                        "Time": time_str
-                    })
-                else:
-                    created_at = getattr(job, 'created_at', 'Unknown')
-                    if hasattr(created_at, 'strftime'):
-                        time_str = created_at.strftime("%Y-%m-%d %H:%M")
-                    else:
-                        time_str = str(created_at)
-                    
-                    job_data.append({
-                        "Job ID": getattr(job, 'job_id', 'Unknown')[:8] + "...",
-                        "Filename": getattr(job, 'filename', 'Unknown'),
-                        "Status": str(getattr(job, 'status', 'Unknown')).upper(),
-                        "Time": time_str
-                    })
-            
-            if job_data:
-                import pandas as pd
-                df = pd.DataFrame(job_data)
-                st.dataframe(df, use_container_width=True)
-            else:
-                st.info("No recent job data available")
+            jobs_df = _jobs_frame(recent_jobs)
+            df = pd.DataFrame({
+                "Job ID": jobs_df['job_id_short'],
+                "Filename": jobs_df['filename'],
+                "Status": jobs_df['status'].fillna('Unknown').str.upper(),
+                "Time": jobs_df['created_at'].dt.strftime("%Y-%m-%d %H:%M").fillna("Unknown")
+            })
+            st.dataframe(df, use_container_width=True)
         else:
             st.info("No recent activity to display")
         
@@ -1825,13 +2029,12 @@ def show_dashboard_page():
         
         with health_col1:
             # API Health Check
-            try:
-                health_response = requests.get(f"{API_BASE_URL}/health", timeout=5)
-                if health_response.status_code == 200:
-                    st.success("API Server: Online")
-                else:
-                    st.error("API Server: Issues detected")
-            except:
+            api_health = _cached_health(API_BASE_URL)
+            if api_health["healthy"]:
+                st.success("API Server: Online")
+            elif api_health["reachable"]:
+                st.error("API Server: Issues detected")
+            else:
                 st.error("API Server: Offline")
         
         with health_col2:
@@ -1846,9 +2049,13 @@ def show_dashboard_page():
         auto_refresh = st.checkbox("Auto-refresh dashboard every 30 seconds")
         
         if auto_refresh:
-            import time
-            time.sleep(1)  # Small delay
-            st.rerun()
+            if HAS_AUTOREFRESH:
+                # Browser schedules the rerun; the server thread is not held
+                st_autorefresh(interval=30_000, key="dashboard_autorefresh")
+            else:
+                import time
+                time.sleep(1)  # Small delay
+                st.rerun()
     
     except Exception as e:
         st.error(f"Dashboard error: {str(e)}")
@@ -1866,7 +2073,7 @@ def show_job_history_page():
     with col1:
         status_filter = st.selectbox(
             "Filter by Status",
-            ["All", "completed", "failed", "processing", "pending"]
+            JOB_STATUS_FILTERS
         )
     
     with col2:
@@ -1880,26 +2087,30 @@ def show_job_history_page():
     jobs = get_recent_jobs(limit, status_filter if status_filter != "All" else None)
     
     if jobs:
-        # Jobs table
-        jobs_df = pd.DataFrame(jobs)
+        # Jobs table (copy: the cached frame is shared across reruns)
+        jobs_df = _jobs_frame(jobs)
         
         # Select columns to display
         display_columns = ['filename', 'status', 'created_at', 'processing_time', 'file_size']
         available_columns = [col for col in display_columns if col in jobs_df.columns]
         
-        # Format the data
-        if 'created_at' in jobs_df.columns:
-            jobs_df['created_at'] = pd.to_datetime(jobs_df['created_at']).dt.strftime('%Y-%m-%d %H:%M:%S')
-        
-        if 'processing_time' in jobs_df.columns:
-            jobs_df['processing_time'] = jobs_df['processing_time'].apply(
-                lambda x: f"{x:.2f}s" if pd.notna(x) else "N/A"
-            )
-        
-        if 'file_size' in jobs_df.columns:
-            jobs_df['file_size'] = jobs_df['file_size'].apply(
-                lambda x: f"{x:,} bytes" if pd.notna(x) else "N/A"
-            )
+        # Format through boolean masks: missing values stay "N/A", only present ones are formatted
+        processing_time = pd.to_numeric(jobs_df['processing_time'], errors='coerce').to_numpy(dtype=float)
+        has_time = ~np.isnan(processing_time)
+        time_text = np.full(len(jobs_df), "N/A", dtype=object)
+        time_text[has_time] = np.char.add(np.char.mod('%.2f', processing_time[has_time]), 's')
+        
+        file_size = pd.to_numeric(jobs_df['file_size'], errors='coerce').to_numpy(dtype=float)
+        has_size = ~np.isnan(file_size)
+        size_text = np.full(len(jobs_df), "N/A", dtype=object)
+        size_text[has_size] = [f"{int(size):,} bytes" for size in file_size[has_size]]
+        
+        # Format the data into a new frame; the cached one keeps its datetime column
+        jobs_df = jobs_df.assign(
+            created_at=jobs_df['created_at'].dt.strftime('%Y-%m-%d %H:%M:%S'),
+            processing_time=time_text,
+            file_size=size_text
+        )
         
         # Display table
         st.dataframe(
@@ -1925,61 +2136,27 @@ def show_job_history_page():
                     st.subheader("Download Results")
                     col1, col2, col3, col4 = st.columns(4)
                     
-                    with col1:
-                        try:
-                            response = requests.get(f"{API_BASE_URL}/jobs/{selected_job_id}/export/json")
-                            if response.status_code == 200:
-                                st.download_button(
-                                    "JSON",
-                                    response.text,
-                                    f"result_{selected_job_id}.json",
-                                    "application/json",
-                                    key=f"history_json_{selected_job_id}"
-                                )
-                        except Exception as e:
-                            st.text("JSON not available")
-                    
-                    with col2:
-                        try:
-                            response = requests.get(f"{API_BASE_URL}/jobs/{selected_job_id}/export/xml")
-                            if response.status_code == 200:
-                                st.download_button(
-                                    "XML",
-                                    response.text,
-                                    f"result_{selected_job_id}.xml",
-                                    "application/xml",
-                                    key=f"history_xml_{selected_job_id}"
-                                )
-                        except Exception as e:
-                            st.text("XML not available")
-                    
-                    with col3:
-                        try:
-                            response = requests.get(f"{API_BASE_URL}/jobs/{selected_job_id}/export/edi")
-                            if response.status_code == 200:
-                                st.download_button(
-                                    "EDI",
-                                    response.text,
-                                    f"result_{selected_job_id}.edi",
-                                    "text/plain",
-                                    key=f"history_edi_{selected_job_id}"
-                                )
-                        except Exception as e:
-                            st.text("EDI not available")
+                    exports = fetch_exports(selected_job_id)
+                    download_specs = [
+                        (col1, "json", "JSON", f"result_{selected_job_id}.json", "application/json"),
+                        (col2, "xml", "XML", f"result_{selected_job_id}.xml", "application/xml"),
+                        (col3, "edi", "EDI", f"result_{selected_job_id}.edi", "text/plain"),
+                        (col4, "validation", "Report", f"validation_report_{selected_job_id}.json", "application/json")
+                    ]
                     
-                    with col4:
-                        try:
-                            response = requests.get(f"{API_BASE_URL}/jobs/{selected_job_id}/export/validation")
-                            if response.status_code == 200:
+                    for column, fmt, label, file_name, mime in download_specs:
+                        with column:
+                            content = exports.get(fmt)
+                            if content is not None:
                                 st.download_button(
-                                    "Report",
-                                    response.text,
-                                    f"validation_report_{selected_job_id}.json",
-                                    "application/json",
-                                    key=f"history_report_{selected_job_id}"
+                                    label,
+                                    content,
+                                    file_name,
+                                    mime,
+                                    key=f"history_{label.lower()}_{selected_job_id}"
                                 )
-                        except Exception as e:
-                            st.text("Report not available")
+                            else:
+                                st.text(f"{label} not available")
     else:
         st.info("No jobs found. Upload some files to see job history.")
 
@@ -2034,6 +2211,7 @@ def show_settings_page():
     
     if st.button("Clear Cache"):
         st.cache_data.clear()
+        get_recent_jobs.clear()
         st.success("Cache cleared!")
     
     # Cleanup
@@ -2045,8 +2223,8 @@ def show_settings_page():
     
     # Check current AI status
     try:
-        from app.ai.analyzer import EDIAIAnalyzer
-        analyzer = EDIAIAnalyzer()
+        from app.ai.analyzer import get_analyzer
+        analyzer = get_analyzer()
         ai_available = analyzer.is_available
     except Exception as e:
         ai_available = False
@@ -2087,7 +2265,7 @@ def show_settings_page():
         # Test API key configuration
         if st.button("Test AI Configuration"):
             try:
-                test_analyzer = EDIAIAnalyzer()
+                test_analyzer = get_analyzer()
                 if test_analyzer.is_available:
                     st.success("✅ AI configuration test successful!")
                 else:
@@ -2101,7 +2279,7 @@ def show_settings_page():
 def test_api_connection(url):
     """Test API connection."""
     try:
-        response = requests.get(f"{url}/health", timeout=5)
+        response = SESSION.get(f"{url}/health", timeout=5)
         if response.status_code == 200:
             st.success("✅ Connection successful!")
         else:
@@ -2110,12 +2288,33 @@ def test_api_connection(url):
         st.error(f"❌ Connection failed: {str(e)}")
 
 
+# Error-message keyword -> category, checked in order
+ERROR_CATEGORIES = {
+    'pyx12': 'pyx12 parsing errors',
+    'fhir': 'FHIR mapping errors',
+    'validation': 'Validation errors'
+}
+
+
+_ERROR_RE = re.compile("|".join(ERROR_CATEGORIES), re.IGNORECASE)
+
+
+def _classify_error(error_msg):
+    """Map a job error message to its dashboard category."""
+    # One case-insensitive scan; keyword priority still follows ERROR_CATEGORIES
+    found = {match.lower() for match in _ERROR_RE.findall(error_msg)}
+    for keyword, category in ERROR_CATEGORIES.items():
+        if keyword in found:
+            return category
+    return 'Processing errors'
+
+
 @st.cache_data(ttl=30)  # Reduced TTL from 60 to 30 seconds for faster updates
 def get_statistics():
     """Get statistics from API or session state (cached)."""
     try:
         # Try API first
-        response = requests.get(f"{API_BASE_URL}/stats")
+        response = SESSION.get(f"{API_BASE_URL}/stats")
         if response.status_code == 200:
             stats = response.json()
             # Debug: ensure success rate is calculated correctly
@@ -2134,63 +2333,30 @@ def get_statistics():
         jobs = st.session_state['jobs']
         total_files = len(jobs)
         
-        # Count truly successful jobs (completed AND valid)
-        successful = 0
-        failed = 0
+        # Vectorized counts over the status/validity/time arrays
+        soa = st.session_state.get('jobs_soa')
+        if soa is None or len(soa['status']) != total_files:
+            soa = st.session_state['jobs_soa'] = _build_jobs_soa(jobs.values())
         
-        for job in jobs.values():
-            job_status = getattr(job, 'status', 'unknown')
-            
-            if job_status == 'completed':
-                # Check if validation was actually successful
-                validation_result = getattr(job, 'validation_result', None)
-                if validation_result:
-                    # Handle both dict and object validation results
-                    if hasattr(validation_result, 'is_valid'):
-                        is_valid = validation_result.is_valid
-                    elif isinstance(validation_result, dict):
-                        is_valid = validation_result.get('is_valid', False)
-                    else:
-                        is_valid = getattr(validation_result, 'is_valid', False)
-                    
-                    if is_valid:
-                        successful += 1
-                    else:
-                        failed += 1  # Completed but invalid = failed
-                else:
-                    # No validation result = failed
-                    failed += 1
-            else:
-                failed += 1
+        # Truly successful jobs are completed AND valid; everything else failed
+        completed = soa['status'] == 'completed'
+        successful = int((completed & soa['is_valid']).sum())
+        failed = total_files - successful
         
         success_rate = (successful / total_files * 100) if total_files > 0 else 0
         
         # Calculate average processing time
-        processing_times = []
-        for job in jobs.values():
-            if hasattr(job, 'processing_time') and job.processing_time:
-                processing_times.append(job.processing_time)
+        processing_times = soa['processing_time']
+        avg_time = float(np.nanmean(processing_times)) if np.isfinite(processing_times).any() else 0
         
-        avg_time = sum(processing_times) / len(processing_times) if processing_times else 0
-        
-        # Collect common errors
-        common_errors = []
+        # Count error categories as we go
+        error_counts = Counter()
         for job in jobs.values():
             error_msg = getattr(job, 'error_message', None)
             if error_msg:
-                # Extract key error types
-                if 'pyx12' in error_msg.lower():
-                    common_errors.append('pyx12 parsing errors')
-                elif 'fhir' in error_msg.lower():
-                    common_errors.append('FHIR mapping errors')
-                elif 'validation' in error_msg.lower():
-                    common_errors.append('Validation errors')
-                else:
-                    common_errors.append('Processing errors')
+                error_counts[_classify_error(error_msg)] += 1
         
         # Get most common errors (top 3)
-        from collections import Counter
-        error_counts = Counter(common_errors)
         most_common = [error for error, count in error_counts.most_common(3)]
         
         return {
@@ -2206,18 +2372,22 @@ def get_statistics():
     return None
 
 
-@st.cache_data(ttl=30)
+@st.cache_resource(ttl=30)
 def get_recent_jobs(limit=20, status=None):
-    """Get recent jobs from API or session state (cached)."""
+    """Get recent jobs from API or session state (cached).
+    
+    Served by reference from st.cache_resource to skip the pickle copy of
+    st.cache_data, so the result is a tuple and callers must not mutate it.
+    """
     try:
         # Try API first
         params = {"limit": limit}
         if status:
             params["status"] = status
         
-        response = requests.get(f"{API_BASE_URL}/jobs", params=params)
+        response = SESSION.get(f"{API_BASE_URL}/jobs", params=params)
         if response.status_code == 200:
-            return response.json()
+            return tuple(response.json())
     except Exception:
         pass
     
@@ -2231,7 +2401,7 @@ def get_recent_jobs(limit=20, status=None):
                 "job_id": job_id,
                 "filename": getattr(job, 'filename', 'unknown'),
                 "status": getattr(job, 'status', 'unknown'),
-                "created_at": getattr(job, 'created_at', datetime.now()).isoformat() if hasattr(job, 'created_at') else datetime.now().isoformat(),
+                "created_at": getattr(job, 'created_at', None) or datetime.now(),
                 "processing_time": getattr(job, 'processing_time', None),
                 "file_size": getattr(job, 'file_size', None)
             }
@@ -2242,15 +2412,67 @@ def get_recent_jobs(limit=20, status=None):
         
         # Sort by created_at (newest first) and limit
         job_list.sort(key=lambda x: x["created_at"], reverse=True)
-        return job_list[:limit]
+        return tuple(job_list[:limit])
     
-    return []
+    return ()
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _jobs_frame(jobs):
+    """Build the recent-jobs DataFrame once, with parsed timestamps and short ids."""
+    jobs_df = pd.DataFrame.from_records(
+        list(jobs), columns=list(JOB_COLUMNS)
+    )
+    # Session jobs already carry datetimes; only API payloads need ISO parsing
+    if not pd.api.types.is_datetime64_any_dtype(jobs_df['created_at']):
+        jobs_df['created_at'] = pd.to_datetime(jobs_df['created_at'], errors='coerce')
+    jobs_df['job_id_short'] = jobs_df['job_id'].fillna('Unknown').str.slice(0, 8) + '...'
+    return jobs_df
+
+
+EXPORT_FORMATS = ('json', 'xml', 'edi', 'validation')
+
+
+def _request_export(job_id, fmt):
+    """Fetch one export format from the API; None if it is unavailable."""
+    try:
+        response = SESSION.get(f"{API_BASE_URL}/jobs/{job_id}/export/{fmt}")
+    except requests.RequestException:
+        return None
+    return response.content if response.status_code == 200 else None
+
+
+class IncompleteExports(Exception):
+    """Raised inside the export cache when a format failed, so the partial result is not cached."""
+
+    def __init__(self, exports):
+        super().__init__("Some export formats are unavailable")
+        self.exports = exports
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_complete_exports(job_id):
+    """Fetch all export formats for a job concurrently; only a complete set is cached."""
+    with ThreadPoolExecutor(max_workers=len(EXPORT_FORMATS)) as executor:
+        exports = dict(zip(EXPORT_FORMATS, executor.map(lambda fmt: _request_export(job_id, fmt), EXPORT_FORMATS)))
+    if None in exports.values():
+        raise IncompleteExports(exports)
+    return exports
+
+
+def fetch_exports(job_id):
+    """Fetch all export formats for a job concurrently instead of one after another."""
+    try:
+        return _fetch_complete_exports(job_id)
+    except IncompleteExports as e:
+        # Failed formats are None; the next call retries them instead of reading a cached failure
+        return e.exports
 
 
 def get_job_details(job_id):
     """Get job details from API."""
     try:
-        response = requests.get(f"{API_BASE_URL}/jobs/{job_id}")
+        response = SESSION.get(f"{API_BASE_URL}/jobs/{job_id}")
         if response.status_code == 200:
             return response.json()
     except Exception:
@@ -2264,7 +2486,7 @@ def get_job_details(job_id):
 def cleanup_old_jobs():
     """Cleanup old jobs."""
     try:
-        response = requests.post(f"{API_BASE_URL}/admin/cleanup")
+        response = SESSION.post(f"{API_BASE_URL}/admin/cleanup")
         if response.status_code == 200:
             st.success("✅ Cleanup completed!")
         else:
@@ -2273,9 +2495,7 @@ def cleanup_old_jobs():
         st.error(f"Cleanup error: {str(e)}")
 
 
-def generate_sample_edi():
-    """Generate a valid sample EDI 278 document with proper TR3 compliance."""
-    return """ISA*00*          *00*          *ZZ*SENDER_ID     *ZZ*RECEIVER_ID   *250621*1200*U*00501*000000001*0*P*>~
+SAMPLE_EDI_278 = """ISA*00*          *00*          *ZZ*SENDER_ID     *ZZ*RECEIVER_ID   *250621*1200*U*00501*000000001*0*P*>~
 GS*HS*SENDER_ID*RECEIVER_ID*20250621*1200*1*X*005010X279A1~
 ST*278*0001~
 BHT*0078*00*REF123*20250621*1200*01~
@@ -2290,14 +2510,48 @@ GE*1*1~
 IEA*1*000000001~"""
 
 
+def generate_sample_edi():
+    """Generate a valid sample EDI 278 document with proper TR3 compliance."""
+    return SAMPLE_EDI_278
+
+
+def _count_values(values):
+    """Distinct values of an object array and their counts, in order of first appearance."""
+    labels, first_seen, counts = np.unique(values, return_index=True, return_counts=True)
+    order = np.argsort(first_seen)
+    return labels[order], counts[order]
+
+
+def _figure(data, layout):
+    """Figure from plain trace/layout dicts on the shared chart template, skipping plotly's per-property validation."""
+    return go.Figure({'data': data, 'layout': {'template': CHART_TEMPLATE, **layout}}, _validate=False)
+
+
+# Figures kept per session by _session_figure; least recently shown charts are dropped first
+PLOT_CACHE_SIZE = 16
+
+
+def _session_figure(key, build, *inputs):
+    """Return the figure built for key, rebuilding only when its inputs changed since last rerun."""
+    plot_cache = st.session_state.setdefault('_plot_cache', OrderedDict())
+    entry = plot_cache.get(key)
+    if entry is None or entry[0] != inputs:
+        entry = plot_cache[key] = (inputs, build(*inputs))
+        if len(plot_cache) > PLOT_CACHE_SIZE:
+            plot_cache.popitem(last=False)
+    plot_cache.move_to_end(key)
+    return entry[1]
+
+
 def create_validation_charts(validation_result, job_id):
     """Create charts and visualizations for validation results."""
+    if not HAS_PLOTLY:
+        return
     
     # Extract validation data
-    if hasattr(validation_result, 'model_dump') or hasattr(validation_result, 'dict'):
-        val_data = safe_model_dump(validation_result)
-    elif isinstance(validation_result, dict):
-        val_data = validation_result
+    to_dict = _pick_adapter(type(validation_result))
+    if to_dict is not None:
+        val_data = to_dict(validation_result)
     else:
         val_data = {
             'is_valid': getattr(validation_result, 'is_valid', False),
@@ -2309,116 +2563,153 @@ def create_validation_charts(validation_result, job_id):
     
     if not issues:
         # Create a success chart
-        fig = go.Figure(data=[go.Pie(
-            labels=['Valid Document'],
-            values=[1],
-            marker_colors=['#28a745'],
-            textinfo='label+percent',
-            textfont_size=16
-        )])
-        fig.update_layout(
-            title="📊 Validation Status",
-            showlegend=False,
-            height=300
+        fig = _figure(
+            [{
+                'type': 'pie',
+                'labels': ['Valid Document'],
+                'values': [1],
+                'marker': {'colors': ['#28a745']},
+                'textinfo': 'label+percent',
+                'textfont': {'size': 16}
+            }],
+            {'title': {'text': "📊 Validation Status"}}
         )
         st.plotly_chart(fig, use_container_width=True)
         return
     
-    # Count issues by severity
-    issue_counts = {}
-    for issue in issues:
-        if isinstance(issue, dict):
-            level = issue.get('level', 'unknown').upper()
-        else:
-            level = getattr(issue, 'level', 'unknown').upper()
-        issue_counts[level] = issue_counts.get(level, 0) + 1
+    # Read (level, segment) once per issue, then count with numpy; pick dict vs attribute access once
+    if isinstance(issues[0], dict):
+        issue_fields = lambda issue: (issue.get('level', 'unknown'), issue.get('segment', 'Unknown'))
+    else:
+        issue_fields = lambda issue: (getattr(issue, 'level', 'unknown'), getattr(issue, 'segment', 'Unknown'))
     
-    if issue_counts:
-        # Create charts in columns
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Pie chart for issue distribution
-            labels = list(issue_counts.keys())
-            values = list(issue_counts.values())
-            
-            # Define colors for each severity level
-            colors = []
-            for label in labels:
-                if label == 'CRITICAL':
-                    colors.append('#dc3545')  # Red
-                elif label == 'ERROR':
-                    colors.append('#fd7e14')  # Orange
-                elif label == 'WARNING':
-                    colors.append('#ffc107')  # Yellow
-                else:
-                    colors.append('#17a2b8')  # Blue
-            
-            fig_pie = go.Figure(data=[go.Pie(
-                labels=labels,
-                values=values,
-                marker_colors=colors,
-                textinfo='label+value+percent',
-                textfont_size=12
-            )])
-            fig_pie.update_layout(
-                title="📊 Issues by Severity",
-                showlegend=True,
-                height=300
-            )
-            st.plotly_chart(fig_pie, use_container_width=True)
-        
-        with col2:
-            # Bar chart for issue counts
-            fig_bar = go.Figure(data=[go.Bar(
-                x=labels,
-                y=values,
-                marker_color=colors,
-                text=values,
-                textposition='auto',
-            )])
-            fig_bar.update_layout(
-                title="📈 Issue Count by Severity",
-                xaxis_title="Severity Level",
-                yaxis_title="Number of Issues",
-                height=300
-            )
-            st.plotly_chart(fig_bar, use_container_width=True)
+    fields = list(map(issue_fields, issues))
+    levels = np.fromiter((level.upper() for level, _ in fields), dtype=object, count=len(fields))
+    segments = np.fromiter((segment or '' for _, segment in fields), dtype=object, count=len(fields))
+    severity_labels, severity_counts = _count_values(levels)
+    segment_labels, segment_counts = _count_values(segments[(segments != '') & (segments != 'N/A')])
+    
+    if len(severity_labels):
+        # Pie and bar share one figure: a single serialization and a single plot element
+        severity_key = tuple(zip(severity_labels.tolist(), severity_counts.tolist()))
+        fig_severity = _session_figure(f"severity_{job_id}", _build_severity_fig, severity_key)
+        st.plotly_chart(fig_severity, use_container_width=True)
         
         # Segment analysis if available
-        segment_counts = {}
-        for issue in issues:
-            if isinstance(issue, dict):
-                segment = issue.get('segment', 'Unknown')
-            else:
-                segment = getattr(issue, 'segment', 'Unknown')
-            if segment and segment != 'N/A':
-                segment_counts[segment] = segment_counts.get(segment, 0) + 1
-        
-        if segment_counts and len(segment_counts) > 1:
+        if len(segment_labels) > 1:
             st.subheader("📋 Issues by Segment")
-            
-            segments = list(segment_counts.keys())
-            counts = list(segment_counts.values())
-            
-            fig_segments = go.Figure(data=[go.Bar(
-                x=segments,
-                y=counts,
-                marker_color='#6c757d',
-                text=counts,
-                textposition='auto',
-            )])
-            fig_segments.update_layout(
-                title="Issues Distribution by EDI Segment",
-                xaxis_title="EDI Segment",
-                yaxis_title="Number of Issues",
-                height=300
-            )
+            # Cap the bar count: keep the busiest segments, fold the rest into "Other"
+            if len(segment_labels) > SEGMENT_CHART_LIMIT:
+                busiest = np.argsort(-segment_counts, kind='stable')[:SEGMENT_CHART_LIMIT]
+                top_segments = list(zip(segment_labels[busiest].tolist(), segment_counts[busiest].tolist()))
+                top_segments.append(('Other', int(segment_counts.sum() - segment_counts[busiest].sum())))
+            else:
+                top_segments = zip(segment_labels.tolist(), segment_counts.tolist())
+            fig_segments = _session_figure(f"segments_{job_id}", _build_segment_fig, tuple(top_segments))
             st.plotly_chart(fig_segments, use_container_width=True)
 
 
+@lru_cache(maxsize=8)
+def _severity_color(level: str) -> str:
+    """Chart color for an upper-cased severity level (blue for anything else)."""
+    return SEVERITY_COLORS.get(level, '#17a2b8')
+
+
+# Severity figure layout: pie on the left, bar on the right, as make_subplots would place them
+SEVERITY_PIE_DOMAIN = [0.0, 0.45]
+SEVERITY_BAR_DOMAIN = [0.55, 1.0]
+
+
+def _subplot_title(text, domain):
+    """Title annotation centered over a subplot's horizontal domain."""
+    return {
+        'text': text,
+        'x': (domain[0] + domain[1]) / 2,
+        'y': 1.0,
+        'xref': 'paper',
+        'yref': 'paper',
+        'xanchor': 'center',
+        'yanchor': 'bottom',
+        'showarrow': False,
+        'font': {'size': 16}
+    }
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _build_severity_fig(severity_counts):
+    """Side-by-side pie and bar for a tuple of (level, count) pairs."""
+    labels = [level for level, _ in severity_counts]
+    values = [count for _, count in severity_counts]
+    
+    # Define colors for each severity level
+    colors = [_severity_color(label) for label in labels]
+    
+    return _figure(
+        [
+            # Pie chart for issue distribution
+            {
+                'type': 'pie',
+                'labels': labels,
+                'values': values,
+                'marker': {'colors': colors},
+                'textinfo': 'label+value+percent',
+                'textfont': {'size': 12},
+                'domain': {'x': SEVERITY_PIE_DOMAIN, 'y': [0.0, 1.0]}
+            },
+            # Bar chart for issue counts
+            {
+                'type': 'bar',
+                'x': labels,
+                'y': values,
+                'marker': {'color': colors},
+                'text': [str(value) for value in values],
+                'textposition': 'auto',
+                'showlegend': False,
+                'xaxis': 'x',
+                'yaxis': 'y'
+            }
+        ],
+        {
+            'xaxis': {'anchor': 'y', 'domain': SEVERITY_BAR_DOMAIN, 'title': {'text': "Severity Level"}},
+            'yaxis': {'anchor': 'x', 'domain': [0.0, 1.0], 'title': {'text': "Number of Issues"}},
+            'annotations': [
+                _subplot_title("📊 Issues by Severity", SEVERITY_PIE_DOMAIN),
+                _subplot_title("📈 Issue Count by Severity", SEVERITY_BAR_DOMAIN)
+            ],
+            'showlegend': True,
+            'height': 320
+        }
+    )
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _build_segment_fig(segment_counts):
+    """Bar figure for a tuple of (segment, count) pairs."""
+    segments = [segment for segment, _ in segment_counts]
+    counts = [count for _, count in segment_counts]
+    
+    fig_segments = _figure(
+        [{
+            'type': 'bar',
+            'x': segments,
+            'y': counts,
+            'marker': {'color': '#6c757d'},
+            'text': [str(count) for count in counts],
+            'textposition': 'auto'
+        }],
+        {
+            'title': {'text': "Issues Distribution by EDI Segment"},
+            'xaxis': {'title': {'text': "EDI Segment"}},
+            'yaxis': {'title': {'text': "Number of Issues"}}
+        }
+    )
+    return fig_segments
+
+
 def create_processing_summary_chart(result, filename):
     """Create a processing summary chart."""
+    if not HAS_PLOTLY:
+        return
     
     # Handle both dict and object access patterns
     if isinstance(result, dict):
@@ -2432,76 +2723,89 @@ def create_processing_summary_chart(result, filename):
         fhir_mapping = getattr(result, 'fhir_mapping', None)
         parsed_edi = getattr(result, 'parsed_edi', None)
     
-    # Create processing status data
-    processing_steps = []
-    
-    # EDI Parsing
-    if parsed_edi:
-        processing_steps.append(('EDI Parsing', 'Success', '#28a745'))
-    else:
-        processing_steps.append(('EDI Parsing', 'Failed', '#dc3545'))
-    
-    # Validation
+    # Reduce the result to the few facts the chart depends on
+    is_valid = None
     if validation_result:
         # Handle both dict and object access for validation_result
         if isinstance(validation_result, dict):
-            is_valid = validation_result.get('is_valid', False)
-        else:
-            is_valid = getattr(validation_result, 'is_valid', False)
-            
-        if is_valid:
-            processing_steps.append(('Validation', 'Success', '#28a745'))
+            is_valid = bool(validation_result.get('is_valid', False))
         else:
-            processing_steps.append(('Validation', 'Issues Found', '#ffc107'))
-    else:
-        processing_steps.append(('Validation', 'Failed', '#dc3545'))
+            is_valid = bool(getattr(validation_result, 'is_valid', False))
     
-    # AI Analysis
+    confidence = None
     if ai_analysis:
         # Handle both dict and object access for ai_analysis
         if isinstance(ai_analysis, dict):
             confidence = ai_analysis.get('confidence_score', 0)
         else:
             confidence = getattr(ai_analysis, 'confidence_score', 0)
-            
-        if confidence >= 0.8:
-            processing_steps.append(('AI Analysis', 'High Confidence', '#28a745'))
-        elif confidence >= 0.6:
-            processing_steps.append(('AI Analysis', 'Medium Confidence', '#ffc107'))
-        else:
-            processing_steps.append(('AI Analysis', 'Low Confidence', '#fd7e14'))
-    else:
-        processing_steps.append(('AI Analysis', 'Not Available', '#6c757d'))
     
-    # FHIR Mapping
-    if fhir_mapping:
-        processing_steps.append(('FHIR Mapping', 'Success', '#28a745'))
-    else:
-        processing_steps.append(('FHIR Mapping', 'Failed', '#dc3545'))
+    processing_steps = _pipeline_steps(bool(parsed_edi), is_valid, confidence, bool(fhir_mapping))
     
+    fig = _session_figure(f"pipeline_{filename}", _build_pipeline_fig, processing_steps, filename)
+    st.plotly_chart(fig, use_container_width=True)
+
+
+# Pipeline chart spec: each step maps its one input fact to (status, color)
+STEP_SUCCESS = ('Success', '#28a745')
+STEP_FAILED = ('Failed', '#dc3545')
+CONFIDENCE_THRESHOLDS = (0.6, 0.8)
+CONFIDENCE_BANDS = (
+    ('Low Confidence', '#fd7e14'),
+    ('Medium Confidence', '#ffc107'),
+    ('High Confidence', '#28a745')
+)
+
+
+def _confidence_bucket(score: float) -> tuple[str, str]:
+    """(status, color) band for an AI confidence score."""
+    return CONFIDENCE_BANDS[bisect_right(CONFIDENCE_THRESHOLDS, score)]
+
+
+PIPELINE_SPEC = (
+    ('EDI Parsing', lambda parsed: STEP_SUCCESS if parsed else STEP_FAILED),
+    ('Validation', lambda is_valid: STEP_FAILED if is_valid is None
+        else STEP_SUCCESS if is_valid else ('Issues Found', '#ffc107')),
+    ('AI Analysis', lambda confidence: ('Not Available', '#6c757d') if confidence is None
+        else _confidence_bucket(confidence)),
+    ('FHIR Mapping', lambda mapped: STEP_SUCCESS if mapped else STEP_FAILED)
+)
+PIPELINE_STEP_NAMES = tuple(name for name, _ in PIPELINE_SPEC)
+
+
+def _pipeline_steps(parsed, is_valid, confidence, mapped):
+    """Parallel (steps, statuses, colors) tuples; is_valid/confidence are None when that stage has no result."""
+    statuses, colors = [], []
+    for (_, resolve), fact in zip(PIPELINE_SPEC, (parsed, is_valid, confidence, mapped)):
+        status, color = resolve(fact)
+        statuses.append(status)
+        colors.append(color)
+    return PIPELINE_STEP_NAMES, tuple(statuses), tuple(colors)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _build_pipeline_fig(processing_steps, filename):
+    """Horizontal status bar figure for parallel (steps, statuses, colors) tuples."""
     # Create horizontal bar chart
-    steps, statuses, colors = zip(*processing_steps)
-    
-    fig = go.Figure(data=[go.Bar(
-        y=steps,
-        x=[1] * len(steps),  # All bars same length
-        orientation='h',
-        marker_color=colors,
-        text=statuses,
-        textposition='inside',
-        textfont_size=12
-    )])
-    
-    fig.update_layout(
-        title=f"🔄 Processing Pipeline Status - {filename}",
-        xaxis_title="",
-        yaxis_title="Processing Steps",
-        height=300,
-        showlegend=False,
-        xaxis={'showticklabels': False}
+    steps, statuses, colors = processing_steps
+    
+    return _figure(
+        [{
+            'type': 'bar',
+            'y': list(steps),
+            'x': [1] * len(steps),  # All bars same length
+            'orientation': 'h',
+            'marker': {'color': list(colors)},
+            'text': list(statuses),
+            'textposition': 'inside',
+            'textfont': {'size': 12}
+        }],
+        {
+            'title': {'text': f"🔄 Processing Pipeline Status - {filename}"},
+            'xaxis': {'title': {'text': ""}, 'showticklabels': False},
+            'yaxis': {'title': {'text': "Processing Steps"}}
+        }
     )
-    
-    st.plotly_chart(fig, use_container_width=True)
 
 
 if __name__ == "__main__":
@@ -1,8 +1,9 @@
 """AI-powered analysis modules."""
 
-from .analyzer import EDIAIAnalyzer, SmartEDIValidator
+from .analyzer import EDIAIAnalyzer, SmartEDIValidator, get_analyzer
  
 __all__ = [
     'EDIAIAnalyzer',
-    'SmartEDIValidator'
+    'SmartEDIValidator',
+    'get_analyzer'
 ] 
\ No newline at end of file
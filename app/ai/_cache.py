@@ -0,0 +1,50 @@
+"""In-process LRU cache with per-entry TTL for AI responses."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class AsyncLRUCache:
+    """Bounded LRU cache with an awaitable interface.
+
+    Guarded by a thread lock rather than an asyncio.Lock: callers run on several
+    event loops (one per Streamlit session thread), and no critical section awaits.
+    """
+
+    def __init__(self, maxsize: int = 256, default_ttl: float = 3600.0):
+        """Initialize an empty cache holding at most maxsize entries."""
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value under key, evicting the least recently used entry when full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (ttl or self.default_ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,61 @@
+"""Fixed-layout records for the AI analysis context."""
+
+from typing import Any, Dict, NamedTuple, Tuple
+
+
+class DocInfo(NamedTuple):
+    """Document-level facts sent to the model."""
+    total_segments: int = 0
+    file_size: int = 0
+    transaction_type: str = ""
+    version: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._asdict()
+
+
+class KeySegment(NamedTuple):
+    """Summary of one leading segment."""
+    id: str
+    elements: int
+    position: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._asdict()
+
+
+class ValidationIssueView(NamedTuple):
+    """Validation issue trimmed to what the prompts use."""
+    level: str
+    message: str
+    code: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._asdict()
+
+
+class ValidationSummary(NamedTuple):
+    """Overall validation outcome."""
+    is_valid: bool = False
+    total_issues: int = 0
+    tr3_compliance: bool = True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._asdict()
+
+
+class AnalysisContext(NamedTuple):
+    """Everything the analyzer tells the model about one document."""
+    document_info: DocInfo = DocInfo()
+    key_segments: Tuple[KeySegment, ...] = ()
+    validation_summary: ValidationSummary = ValidationSummary()
+    validation_issues: Tuple[ValidationIssueView, ...] = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Nested plain-dict form for JSON serialization."""
+        return {
+            "document_info": self.document_info.to_dict(),
+            "key_segments": [segment.to_dict() for segment in self.key_segments],
+            "validation_summary": self.validation_summary.to_dict(),
+            "validation_issues": [issue.to_dict() for issue in self.validation_issues]
+        }
@@ -0,0 +1,46 @@
+"""Proactive token-bucket rate limiting for AI API calls."""
+
+import asyncio
+import threading
+import time
+
+
+class AsyncRateLimiter:
+    """Requests-per-minute and tokens-per-minute buckets.
+
+    acquire() waits until both buckets have capacity, so calls are spaced out
+    before the provider starts answering 429. State is guarded by a thread lock:
+    the limiter is process-wide and callers run on several event loops.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        """Initialize with both buckets full."""
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+        self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+        self._updated = now
+
+    async def acquire(self, tokens: int = 1) -> None:
+        """Wait for one request slot and an estimated token budget, then consume them."""
+        tokens = min(tokens, self.tokens_per_minute)  # an oversized call still gets through on a full bucket
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._requests >= 1 and self._tokens >= tokens:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    return
+                wait = max(
+                    (1 - self._requests) * 60 / self.requests_per_minute,
+                    (tokens - self._tokens) * 60 / self.tokens_per_minute,
+                    0.01
+                )
+            await asyncio.sleep(wait)
@@ -1,34 +1,259 @@
 """AI-powered EDI analysis using Groq API with Llama 3."""
 
+import hashlib
+import importlib.util
 import json
 import re
 import os
-from typing import Dict, List, Optional, Any
+import random
+import sys
+import weakref
+from itertools import islice
+from typing import Dict, List, Optional, Any, Pattern
 import asyncio
+from collections import Counter
 from datetime import datetime
 
-# AI API imports
+# AI API imports are deferred to client construction; only probe that groq is installed
+GROQ_AVAILABLE = importlib.util.find_spec("groq") is not None
+
+# HTTP/2 needs the optional h2 package; fall back to pooled HTTP/1.1 keep-alive without it
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# orjson is optional; fall back to the stdlib codec.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so handlers catch either.
 try:
-    from groq import Groq
-    GROQ_AVAILABLE = True
+    import orjson
+    HAS_ORJSON = True
 except ImportError:
-    GROQ_AVAILABLE = False
-    Groq = None
+    HAS_ORJSON = False
 
 from ..config import settings
 from ..core.models import (
     ParsedEDI, ValidationResult, AIAnalysis, ValidationIssue, ValidationLevel
 )
 from ..core.logger import get_logger
+from ._cache import AsyncLRUCache
+from ._context import AnalysisContext, DocInfo, KeySegment, ValidationIssueView, ValidationSummary
+from ._ratelimit import AsyncRateLimiter
 
 logger = get_logger(__name__)
 
+SYSTEM_PROMPT = (
+    "You are an expert EDI analyst specializing in X12 278 healthcare transactions. "
+    "Provide accurate, concise analysis in the requested format. Be specific and helpful."
+)
+SYSTEM_MSG = {"role": "system", "content": SYSTEM_PROMPT}
+
+# Prompt templates, rendered with str.format_map on a small dict of precomputed fields
+COMBINED_PROMPT = """Analyze this X12 278 EDI document:
+
+Document Info: {document_info}
+Validation status: {is_valid}
+Validation Issues: {issue_count} issues found ({error_count} errors, {warning_count} warnings)
+
+Complete all four tasks:
+1. anomalies: specific problems with document structure, data consistency, compliance or unusual patterns (max 5)
+2. patterns: document quality, structure compliance and processing confidence
+3. suggestions: 3-5 specific, actionable improvements
+4. risk: overall risk level, one of "low", "medium", "high"
+
+Respond with only this JSON object:
+{{"anomalies": ["anomaly1", ...], "patterns": {{"quality": "high/medium/low", "structure": "description", "confidence": 0.0-1.0}}, "suggestions": ["suggestion1", ...], "risk": "low/medium/high"}}"""
+
+ANOMALY_PROMPT = """Analyze this X12 278 EDI document for anomalies and issues:
+
+Document Info: {document_info}
+Validation Issues: {issue_count} issues found
+
+Identify potential problems with:
+1. Document structure
+2. Data consistency
+3. Compliance issues
+4. Unusual patterns
+
+Respond with a JSON array of specific anomaly descriptions (max 5):
+["anomaly1", "anomaly2", ...]"""
+
+PATTERN_PROMPT = """Analyze patterns in this X12 278 EDI document:
+
+Document segments: {total_segments}
+Validation status: {is_valid}
+
+Provide a brief analysis of:
+1. Document quality
+2. Structure compliance
+3. Processing confidence
+
+Respond with JSON: {{"quality": "high/medium/low", "structure": "description", "confidence": 0.0-1.0}}"""
+
+SUGGESTION_PROMPT = """Based on this X12 278 EDI analysis with {issue_count} validation issues, suggest specific improvements:
+
+Document: {total_segments} segments
+Valid: {is_valid}
+
+Provide 3-5 specific, actionable suggestions as a JSON array:
+["suggestion1", "suggestion2", ...]"""
+
+BATCH_PROMPT = """Analyze each of these X12 278 EDI documents:
+
+Documents: {documents}
+
+For every document complete all four tasks:
+1. anomalies: specific problems with document structure, data consistency, compliance or unusual patterns (max 5)
+2. patterns: document quality, structure compliance and processing confidence
+3. suggestions: 3-5 specific, actionable improvements
+4. risk: overall risk level, one of "low", "medium", "high"
+
+Respond with only a JSON array holding one object per document, in the same order:
+[{{"anomalies": ["anomaly1", ...], "patterns": {{"quality": "high/medium/low", "structure": "description", "confidence": 0.0-1.0}}, "suggestions": ["suggestion1", ...], "risk": "low/medium/high"}}, ...]"""
+
+RISK_PROMPT = '''Assess the risk level for this X12 278 EDI document:
+- Errors: {error_count}
+- Warnings: {warning_count}
+- Valid: {is_valid}
+
+Respond with only one word: "low", "medium", or "high"'''
+
+RISK_LEVELS = ("low", "medium", "high")
+
+# Enum members are singletons: counting loops compare by identity instead of str.__eq__.
+# _LEVEL_MEMBERS maps raw level strings (and members, which hash alike) to the member.
+_CRIT, _ERR, _WARN = ValidationLevel.CRITICAL, ValidationLevel.ERROR, ValidationLevel.WARNING
+_LEVEL_MEMBERS = {level.value: level for level in ValidationLevel}
+ISSUE_MESSAGE_CHARS = 80  # the model needs a hint of each issue, not the full message
+ANALYSIS_BATCH_SIZE = 8  # documents per batched request; keeps prompt and reply within the token budget
+
+# Reply parsing: one bullet/prose line per match as (bullet marker, text), and a JSON array wrapped in prose
+_BULLET_RE = re.compile(r'^[ \t]*([-*•]?)[-*• \t]*([^-*•\s].*?)\s*$', re.M)
+_JSON_ARRAY_RE = re.compile(r'\[.*\]', re.S)
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.S)
+# Risk reply: the level word, after any leading whitespace, quotes or bullet marks
+_RISK_RE = re.compile(r'[\s"\'*•-]*(low|medium|high)', re.I)
+
+# Responses are only reused for low-temperature (effectively deterministic) calls
+CACHEABLE_TEMPERATURE = 0.3
+_response_cache = AsyncLRUCache(maxsize=256, default_ttl=3600)
+
+# Groq limits are per API key, so one limiter is shared by every analyzer in the process
+RATE_LIMIT_RETRIES = 3
+_rate_limiter = AsyncRateLimiter(
+    getattr(settings, "groq_requests_per_minute", 30),
+    getattr(settings, "groq_tokens_per_minute", 6000)
+)
+
 
 class AIAnalysisError(Exception):
     """Custom exception for AI analysis errors."""
     pass
 
 
+# Groq API key once found; a missing key is not cached, so secrets added later are picked up
+_groq_key: Optional[str] = None
+
+
+def _resolve_groq_key() -> Optional[str]:
+    """Groq API key from Streamlit secrets, settings or the environment; cached once found."""
+    global _groq_key
+    if _groq_key:
+        return _groq_key
+    api_key = None
+    
+    # 1. Check Streamlit secrets (for Streamlit Cloud deployment); only when running under Streamlit
+    if "streamlit" in sys.modules:
+        try:
+            st = sys.modules["streamlit"]
+            if hasattr(st, 'secrets') and 'GROQ_API_KEY' in st.secrets:
+                api_key = st.secrets['GROQ_API_KEY']
+                logger.info("✅ Found Groq API key in Streamlit secrets")
+        except Exception:
+            pass  # Streamlit secrets not available
+    
+    # 2. Check settings and environment variables
+    if not api_key:
+        api_key = settings.groq_api_key or os.getenv("GROQ_API_KEY")
+        if api_key:
+            logger.info("✅ Found Groq API key in environment/settings")
+    
+    if api_key and api_key.strip() and api_key != "your_groq_api_key_here":
+        _groq_key = api_key.strip()
+        return _groq_key
+    return None
+
+
+if HAS_ORJSON:
+    _loads = orjson.loads
+
+    def _dumps(obj: Any) -> str:
+        """Compact JSON text."""
+        return orjson.dumps(obj, default=str).decode()
+else:
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> str:
+        """Compact JSON text."""
+        return json.dumps(obj, separators=(",", ":"), default=str)
+
+
+def _compact(data: Dict[str, Any]) -> str:
+    """Minimal JSON for prompts: no indentation or spaces, and no empty fields (every byte is billed)."""
+    return _dumps({key: value for key, value in data.items() if value not in (None, "", [], {})})
+
+
+def _issue_counts(validation_result: ValidationResult) -> Counter:
+    """Tally validation issues by level in a single pass."""
+    return Counter(issue.level for issue in validation_result.issues)
+
+
+def _retry_after(error: Exception, attempt: int) -> float:
+    """Seconds to wait before retrying a rate-limited call: the server's retry-after, else exponential."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return float(2 ** attempt)
+
+
+def _embedded_json_list(response: str) -> Optional[list]:
+    """JSON array found inside a prose reply, or None."""
+    match = _JSON_ARRAY_RE.search(response)
+    if match:
+        try:
+            result = _loads(match.group(0))
+        except json.JSONDecodeError:
+            return None
+        if isinstance(result, list):
+            return result
+    return None
+
+
+def _combined_result(result: Any) -> Optional[tuple]:
+    """(anomalies, patterns, suggestions, risk) from one parsed combined-analysis object, or None if malformed."""
+    if not isinstance(result, dict):
+        return None
+    anomalies = result.get('anomalies')
+    patterns = result.get('patterns')
+    suggestions = result.get('suggestions')
+    risk = str(result.get('risk', '')).strip().lower()
+    if not (isinstance(anomalies, list) and isinstance(patterns, dict)
+            and isinstance(suggestions, list) and risk in RISK_LEVELS):
+        return None
+    return [str(a) for a in anomalies[:5]], patterns, [str(s) for s in suggestions[:8]], risk
+
+
+def _severity_counts(context: AnalysisContext) -> tuple:
+    """(errors including critical, warnings) among the context's validation issues."""
+    issues = context.validation_issues
+    error_count = sum(1 for issue in issues if issue.level is _ERR or issue.level is _CRIT)
+    warning_count = sum(1 for issue in issues if issue.level is _WARN)
+    return error_count, warning_count
+
+
+def _reply_lines(response: str, min_length: int) -> List[str]:
+    """Bullet lines, and prose lines longer than min_length, with bullet markers stripped."""
+    return [text for marker, text in _BULLET_RE.findall(response) if marker or len(text) > min_length]
+
+
 class EDIAIAnalyzer:
     """AI-powered analyzer for EDI documents using Groq API."""
     
@@ -37,32 +262,23 @@ class EDIAIAnalyzer:
         self.groq_client = None
         self.model = "llama-3.1-8b-instant"  # Updated to confirmed working model
         self.max_tokens = 1024
+        self.combined_max_tokens = 1536  # room for all four sections in one reply
+        self.batch_max_tokens = 4096  # shared by up to ANALYSIS_BATCH_SIZE documents
         self.temperature = 0.3  # Optimized temperature
         self.ai_available = False
+        self._api_key = None
+        # Pooled connections belong to the event loop that opened them, so each loop gets its own
+        # client, stored with its prebound chat.completions.create
+        self._loop_clients = weakref.WeakKeyDictionary()
+        self._client_adopted = False
         
         # Initialize Groq client with robust error handling
         if GROQ_AVAILABLE:
             try:
-                # Get API key from multiple sources
-                api_key = None
-                
-                # 1. Check Streamlit secrets (for Streamlit Cloud deployment)
-                try:
-                    import streamlit as st
-                    if hasattr(st, 'secrets') and 'GROQ_API_KEY' in st.secrets:
-                        api_key = st.secrets['GROQ_API_KEY']
-                        logger.info("✅ Found Groq API key in Streamlit secrets")
-                except Exception:
-                    pass  # Streamlit secrets not available
-                
-                # 2. Check settings and environment variables
-                if not api_key:
-                    api_key = settings.groq_api_key or os.getenv("GROQ_API_KEY")
-                    if api_key:
-                        logger.info("✅ Found Groq API key in environment/settings")
-                
-                if api_key and api_key.strip() and api_key != "your_groq_api_key_here":
-                    self.groq_client = Groq(api_key=api_key.strip())
+                api_key = _resolve_groq_key()
+                if api_key:
+                    self._api_key = api_key
+                    self.groq_client = self._new_client()
                     self.ai_available = True
                     logger.info("✅ Groq AI client initialized successfully")
                     logger.info(f"🤖 Using model: {self.model}")
@@ -77,10 +293,46 @@ class EDIAIAnalyzer:
             logger.warning("⚠️ Groq library not available. Install with: pip install groq")
             self.ai_available = False
     
+    def _new_client(self) -> "AsyncGroq":
+        """Groq client on a keep-alive connection pool (HTTP/2 when h2 is installed)."""
+        import httpx
+        from groq import AsyncGroq
+        
+        http_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+            timeout=30.0
+        )
+        return AsyncGroq(api_key=self._api_key, http_client=http_client)
+    
+    def _chat_create(self):
+        """chat.completions.create of the running event loop's Groq client, bound once per loop."""
+        loop = asyncio.get_running_loop()
+        entry = self._loop_clients.get(loop)
+        if entry is None:
+            if not self._client_adopted:
+                # The first loop takes the client built in __init__
+                client, self._client_adopted = self.groq_client, True
+            else:
+                client = self._new_client()
+            entry = self._loop_clients[loop] = (client, client.chat.completions.create)
+        return entry[1]
+    
+    async def aclose(self) -> None:
+        """Close the running loop's Groq client and its connection pool."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        entry = self._loop_clients.pop(loop, None)
+        if entry is not None:
+            await entry[0].close()
+    
     @property
     def is_available(self) -> bool:
         """Check if AI analysis is available."""
-        return self.ai_available and self.groq_client is not None
+        # ai_available is only set once the client has been built
+        return self.ai_available
     
     async def analyze_edi(self, parsed_edi: ParsedEDI, 
                          validation_result: ValidationResult) -> AIAnalysis:
@@ -94,112 +346,172 @@ class EDIAIAnalyzer:
         Returns:
             AIAnalysis: Complete AI analysis results
         """
-        if not self.is_available:
-            logger.info("🤖 AI analysis not available - creating fallback analysis")
-            return self._create_fallback_analysis(parsed_edi, validation_result)
-        
+        counts = None
         try:
+            # A malformed issue list fails here and takes the fallback below
+            counts = _issue_counts(validation_result)
+            
+            analysis = self._analysis_without_ai(parsed_edi, validation_result, counts)
+            if analysis is not None:
+                return analysis
+            
             logger.info("🧠 Starting comprehensive AI analysis of EDI X12 278...")
             
             # Prepare analysis context
             context = self._prepare_analysis_context(parsed_edi, validation_result)
             
-            # Run analysis tasks with proper error handling
+            # One fused request covers all four tasks; fall back to the per-task calls if its reply is unusable
+            try:
+                combined = await self._analyze_combined(context)
+            except Exception as combined_error:
+                logger.warning(f"Combined AI analysis failed: {combined_error}, using per-task analysis")
+                combined = None
+            
             try:
-                anomalies = await self._detect_anomalies_safe(context)
-                patterns = await self._analyze_patterns_safe(context)
-                suggestions = await self._suggest_improvements_safe(context)
-                risk = await self._assess_risk_safe(context)
+                if combined is not None:
+                    anomalies, patterns, suggestions, risk = combined
+                else:
+                    # Run the independent analysis tasks concurrently; wall time is the slowest call, not the sum
+                    results = await asyncio.gather(
+                        self._detect_anomalies_safe(context),
+                        self._analyze_patterns_safe(context),
+                        self._suggest_improvements_safe(context),
+                        self._assess_risk_safe(context),
+                        return_exceptions=True
+                    )
+                    anomalies, patterns, suggestions, risk = (
+                        fallback if isinstance(result, BaseException) else result
+                        for result, fallback in zip(results, (
+                            ["AI anomaly detection temporarily unavailable"],
+                            {"analysis_type": "rule_based"},
+                            ["Review document structure and validation results"],
+                            "medium"
+                        ))
+                    )
             except Exception as analysis_error:
                 logger.warning(f"AI analysis error: {analysis_error}, using fallback")
-                return self._create_fallback_analysis(parsed_edi, validation_result)
-            
-            # Calculate confidence score
-            confidence = self._calculate_confidence_score(validation_result, anomalies, patterns)
-            
-            # Create comprehensive analysis
-            analysis = AIAnalysis(
-                anomalies_detected=anomalies or [],
-                confidence_score=confidence,
-                suggested_fixes=suggestions or [],
-                pattern_analysis=patterns or {},
-                risk_assessment=risk or "medium"
-            )
+                return self._create_fallback_analysis(parsed_edi, validation_result, counts)
             
-            logger.info(f"✅ AI analysis completed - Confidence: {confidence:.2f}, Risk: {risk}")
-            return analysis
+            return self._build_analysis(validation_result, counts, anomalies, patterns, suggestions, risk)
             
         except Exception as e:
             logger.error(f"❌ AI analysis failed: {str(e)}")
-            return self._create_fallback_analysis(parsed_edi, validation_result)
+            return self._create_fallback_analysis(parsed_edi, validation_result, counts)
+    
+    async def analyze_many(self, items: List[tuple]) -> List[AIAnalysis]:
+        """
+        Analyze several EDI documents, batching up to ANALYSIS_BATCH_SIZE of them per Groq call.
+        
+        Args:
+            items: (parsed_edi, validation_result) pairs
+            
+        Returns:
+            List[AIAnalysis]: One analysis per item, in order
+        """
+        analyses: List[Optional[AIAnalysis]] = [None] * len(items)
+        counts: List[Optional[Counter]] = [None] * len(items)
+        
+        pending = []
+        for index, (parsed_edi, validation_result) in enumerate(items):
+            try:
+                counts[index] = _issue_counts(validation_result)
+                analyses[index] = self._analysis_without_ai(parsed_edi, validation_result, counts[index])
+            except Exception as e:
+                logger.error(f"❌ AI analysis failed: {str(e)}")
+                analyses[index] = self._create_fallback_analysis(parsed_edi, validation_result)
+                continue
+            if analyses[index] is None:
+                pending.append(index)
+        
+        async def run_batch(batch: List[int]) -> None:
+            try:
+                contexts = [self._prepare_analysis_context(*items[index]) for index in batch]
+                results = await self._analyze_batch(contexts)
+            except Exception as batch_error:
+                logger.warning(f"Batched AI analysis failed: {batch_error}, analyzing documents individually")
+                results = None
+            if results is None:
+                results = [None] * len(batch)
+            
+            # Documents the batch reply did not cover go through the single-document path
+            retry = [index for index, combined in zip(batch, results) if combined is None]
+            for index, combined in zip(batch, results):
+                if combined is not None:
+                    analyses[index] = self._build_analysis(items[index][1], counts[index], *combined)
+            single = await asyncio.gather(*(self.analyze_edi(*items[index]) for index in retry))
+            for index, analysis in zip(retry, single):
+                analyses[index] = analysis
+        
+        await asyncio.gather(*(
+            run_batch(pending[start:start + ANALYSIS_BATCH_SIZE])
+            for start in range(0, len(pending), ANALYSIS_BATCH_SIZE)
+        ))
+        return analyses
+    
+    def _analysis_without_ai(self, parsed_edi: ParsedEDI, validation_result: ValidationResult,
+                             counts: Counter) -> Optional[AIAnalysis]:
+        """Rule-based analysis when the model is unavailable or has nothing to diagnose; None if AI should run."""
+        if not self.is_available:
+            logger.info("🤖 AI analysis not available - creating fallback analysis")
+            return self._create_fallback_analysis(parsed_edi, validation_result, counts)
+        
+        # Clean, compliant documents leave the model nothing to diagnose; the rule-based analysis covers them
+        if (counts[_CRIT] == 0 and counts[_ERR] == 0
+                and validation_result.tr3_compliance and validation_result.is_valid):
+            logger.info("✅ No errors to diagnose - skipping AI analysis")
+            analysis = self._create_fallback_analysis(parsed_edi, validation_result, counts)
+            analysis.pattern_analysis["analysis_type"] = "ai_skipped_happy_path"
+            analysis.pattern_analysis["ai_available"] = True
+            return analysis
+        
+        return None
+    
+    def _build_analysis(self, validation_result: ValidationResult, counts: Counter,
+                        anomalies: List[str], patterns: Dict[str, Any],
+                        suggestions: List[str], risk: str) -> AIAnalysis:
+        """Assemble the AIAnalysis for one document from its model results."""
+        # Calculate confidence score
+        confidence = self._calculate_confidence_score(validation_result, anomalies, patterns, counts)
+        
+        # Create comprehensive analysis
+        analysis = AIAnalysis(
+            anomalies_detected=anomalies or [],
+            confidence_score=confidence,
+            suggested_fixes=suggestions or [],
+            pattern_analysis=patterns or {},
+            risk_assessment=risk or "medium"
+        )
+        
+        logger.info(f"✅ AI analysis completed - Confidence: {confidence:.2f}, Risk: {risk}")
+        return analysis
     
     def _create_fallback_analysis(self, parsed_edi: ParsedEDI, 
-                                validation_result: ValidationResult) -> AIAnalysis:
+                                validation_result: ValidationResult,
+                                counts: Optional[Counter] = None) -> AIAnalysis:
         """Create fallback analysis when AI is unavailable."""
         try:
             logger.info("🔄 Creating rule-based fallback analysis")
             
+            # Count validation issues by severity
+            if counts is None:
+                counts = _issue_counts(validation_result)
+            critical_count = counts[_CRIT]
+            error_count = counts[_ERR]
+            warning_count = counts[_WARN]
+            segcount = len(parsed_edi.segments)
+            
             # Basic rule-based analysis
             anomalies = []
-            suggestions = []
-            
-            # Count validation issues by severity
-            critical_count = sum(1 for issue in validation_result.issues 
-                               if issue.level == ValidationLevel.CRITICAL)
-            error_count = sum(1 for issue in validation_result.issues 
-                            if issue.level == ValidationLevel.ERROR)
-            warning_count = sum(1 for issue in validation_result.issues 
-                              if issue.level == ValidationLevel.WARNING)
-            
-            # Positive feedback for successful parsing
-            if len(parsed_edi.segments) >= 5:
-                suggestions.append(f"✅ Successfully parsed {len(parsed_edi.segments)} EDI segments - document structure is solid")
-                
-                # Extra positive feedback for well-structured documents
-                if len(parsed_edi.segments) >= 10:
-                    suggestions.append("✅ Comprehensive document structure detected - excellent completeness")
-            else:
+            if segcount < 5:
                 anomalies.append("Document appears incomplete - very few segments detected")
-                suggestions.append("Verify all required segments are present")
-            
-            # Analysis based on validation results with positive tone
-            if critical_count == 0 and error_count == 0:
-                suggestions.append("🎉 Excellent! No critical errors or validation issues detected")
-                suggestions.append("✅ Document meets high quality standards for processing")
-            elif critical_count == 0 and error_count <= 2:
-                suggestions.append("✅ Good document quality - only minor validation issues detected")
-                suggestions.append(f"📋 Review {error_count} minor issue(s) for optimal compliance")
-            elif critical_count > 0:
+            if critical_count > 0:
                 anomalies.append(f"Found {critical_count} critical issue(s) requiring immediate attention")
-                suggestions.append("🔧 Address critical issues before processing")
-            
-            if error_count > 0 and critical_count == 0:
+            elif error_count > 0:
                 anomalies.append(f"Detected {error_count} validation error(s)")
-                suggestions.append("📝 Review and fix validation errors for full compliance")
-            
-            if warning_count > 0:
-                suggestions.append(f"💡 Consider addressing {warning_count} warning(s) for optimal compliance")
-            
-            # TR3 compliance feedback with positive tone
-            if validation_result.tr3_compliance:
-                suggestions.append("✅ TR3 implementation guide compliance verified")
-            else:
+            if not validation_result.tr3_compliance:
                 anomalies.append("Document may not be fully TR3 compliant")
-                suggestions.append("📖 Review TR3 implementation guide requirements")
-            
-            # Positive reinforcement for good documents
-            if validation_result.is_valid:
-                suggestions.append("✅ Document passed comprehensive validation requirements")
-                suggestions.append("🚀 Ready for further processing and FHIR mapping")
-            
-            # Parsing method feedback with positive spin
-            if hasattr(parsed_edi, 'parsing_method'):
-                if parsed_edi.parsing_method == 'pyx12_enhanced':
-                    suggestions.append("⭐ Successfully processed using industry-standard pyx12 library")
-                elif parsed_edi.parsing_method == 'manual_fallback':
-                    suggestions.append("💪 Successfully processed using robust manual parsing engine")
-                else:
-                    suggestions.append(f"✅ Document parsed successfully using {parsed_edi.parsing_method}")
+            
+            suggestions = list(self._iter_fallback_suggestions(counts, parsed_edi, validation_result))
             
             # Calculate optimistic confidence based on results
             if critical_count == 0 and error_count == 0:
@@ -212,7 +524,7 @@ class EDIAIAnalyzer:
                 confidence = 0.5
             
             # Bonus for good parsing
-            if len(parsed_edi.segments) >= 10:
+            if segcount >= 10:
                 confidence = min(1.0, confidence + 0.05)
             
             # Risk assessment with more optimistic scaling
@@ -230,7 +542,7 @@ class EDIAIAnalyzer:
                 pattern_analysis={
                     "analysis_type": "rule_based_enhanced", 
                     "ai_available": False,
-                    "segments_analyzed": len(parsed_edi.segments),
+                    "segments_analyzed": segcount,
                     "validation_issues": {
                         "critical": critical_count,
                         "errors": error_count,
@@ -263,51 +575,164 @@ class EDIAIAnalyzer:
                 risk_assessment="low"
             )
     
+    @staticmethod
+    def _iter_fallback_suggestions(counts: Counter, parsed_edi: ParsedEDI,
+                                   validation_result: ValidationResult):
+        """Yield the rule-based suggestions whose conditions hold, in display order."""
+        critical_count = counts[_CRIT]
+        error_count = counts[_ERR]
+        warning_count = counts[_WARN]
+        segcount = len(parsed_edi.segments)
+        
+        # Positive feedback for successful parsing
+        if segcount >= 5:
+            yield f"✅ Successfully parsed {segcount} EDI segments - document structure is solid"
+            
+            # Extra positive feedback for well-structured documents
+            if segcount >= 10:
+                yield "✅ Comprehensive document structure detected - excellent completeness"
+        else:
+            yield "Verify all required segments are present"
+        
+        # Analysis based on validation results with positive tone
+        if critical_count == 0 and error_count == 0:
+            yield "🎉 Excellent! No critical errors or validation issues detected"
+            yield "✅ Document meets high quality standards for processing"
+        elif critical_count == 0 and error_count <= 2:
+            yield "✅ Good document quality - only minor validation issues detected"
+            yield f"📋 Review {error_count} minor issue(s) for optimal compliance"
+        elif critical_count > 0:
+            yield "🔧 Address critical issues before processing"
+        
+        if error_count > 0 and critical_count == 0:
+            yield "📝 Review and fix validation errors for full compliance"
+        
+        if warning_count > 0:
+            yield f"💡 Consider addressing {warning_count} warning(s) for optimal compliance"
+        
+        # TR3 compliance feedback with positive tone
+        if validation_result.tr3_compliance:
+            yield "✅ TR3 implementation guide compliance verified"
+        else:
+            yield "📖 Review TR3 implementation guide requirements"
+        
+        # Positive reinforcement for good documents
+        if validation_result.is_valid:
+            yield "✅ Document passed comprehensive validation requirements"
+            yield "🚀 Ready for further processing and FHIR mapping"
+        
+        # Parsing method feedback with positive spin
+        parsing_method = getattr(parsed_edi, 'parsing_method', None)
+        if parsing_method == 'pyx12_enhanced':
+            yield "⭐ Successfully processed using industry-standard pyx12 library"
+        elif parsing_method == 'manual_fallback':
+            yield "💪 Successfully processed using robust manual parsing engine"
+        elif hasattr(parsed_edi, 'parsing_method'):
+            yield f"✅ Document parsed successfully using {parsing_method}"
+    
     def _prepare_analysis_context(self, parsed_edi: ParsedEDI, 
-                                validation_result: ValidationResult) -> Dict[str, Any]:
+                                validation_result: ValidationResult) -> AnalysisContext:
         """Prepare comprehensive context for AI analysis."""
         try:
-            # Extract key segments for analysis
-            key_segments = []
-            for i, segment in enumerate(parsed_edi.segments[:10]):  # First 10 segments
-                key_segments.append({
-                    "id": segment.segment_id,
-                    "elements": len(segment.elements),
-                    "position": segment.position
-                })
+            # Extract key segments for analysis (first 10, without copying the segment list)
+            key_segments = tuple(
+                KeySegment(segment.segment_id, len(segment.elements), segment.position)
+                for segment in islice(parsed_edi.segments, 10)
+            )
             
             # Extract validation issues
-            validation_issues = []
-            for issue in validation_result.issues:
-                validation_issues.append({
-                    "level": issue.level.value if hasattr(issue.level, 'value') else str(issue.level),
-                    "message": issue.message,
-                    "code": issue.code
-                })
-            
-            context = {
-                "document_info": {
-                    "total_segments": len(parsed_edi.segments),
-                    "file_size": parsed_edi.file_size,
-                    "transaction_type": parsed_edi.header.transaction_type,
-                    "version": parsed_edi.header.version
-                },
-                "key_segments": key_segments,
-                "validation_summary": {
-                    "is_valid": validation_result.is_valid,
-                    "total_issues": len(validation_result.issues),
-                    "tr3_compliance": validation_result.tr3_compliance
-                },
-                "validation_issues": validation_issues
-            }
+            validation_issues = tuple(
+                ValidationIssueView(
+                    _LEVEL_MEMBERS.get(issue.level, issue.level), issue.message[:ISSUE_MESSAGE_CHARS], issue.code
+                )
+                for issue in validation_result.issues
+            )
             
-            return context
+            return AnalysisContext(
+                document_info=DocInfo(
+                    total_segments=len(parsed_edi.segments),
+                    file_size=parsed_edi.file_size,
+                    transaction_type=parsed_edi.header.transaction_type,
+                    version=parsed_edi.header.version
+                ),
+                key_segments=key_segments,
+                validation_summary=ValidationSummary(
+                    is_valid=validation_result.is_valid,
+                    total_issues=len(validation_result.issues),
+                    tr3_compliance=validation_result.tr3_compliance
+                ),
+                validation_issues=validation_issues
+            )
             
         except Exception as e:
             logger.error(f"Context preparation failed: {str(e)}")
-            return {"error": "context_preparation_failed"}
+            return AnalysisContext()
     
-    async def _detect_anomalies_safe(self, context: Dict[str, Any]) -> List[str]:
+    async def _analyze_combined(self, context: AnalysisContext) -> Optional[tuple]:
+        """
+        Run anomaly, pattern, suggestion and risk analysis in a single Groq call.
+        
+        Returns:
+            (anomalies, patterns, suggestions, risk), or None if the reply is not the expected JSON
+        """
+        error_count, warning_count = _severity_counts(context)
+        
+        prompt = COMBINED_PROMPT.format_map({
+            "document_info": _compact(context.document_info.to_dict()),
+            "is_valid": context.validation_summary.is_valid,
+            "issue_count": len(context.validation_issues),
+            "error_count": error_count,
+            "warning_count": warning_count
+        })
+        
+        response = await self._call_groq_api(prompt, max_tokens=self.combined_max_tokens)
+        
+        try:
+            result = _loads(response)
+        except json.JSONDecodeError:
+            # Tolerate prose around the object
+            match = _JSON_OBJECT_RE.search(response)
+            if not match:
+                return None
+            try:
+                result = _loads(match.group(0))
+            except json.JSONDecodeError:
+                return None
+        
+        return _combined_result(result)
+    
+    async def _analyze_batch(self, contexts: List[AnalysisContext]) -> Optional[list]:
+        """
+        Run the combined analysis for several documents in a single Groq call.
+        
+        Returns:
+            One (anomalies, patterns, suggestions, risk) tuple, or None, per context in order;
+            None overall if the reply is not a JSON array of the right length
+        """
+        documents = []
+        for context in contexts:
+            error_count, warning_count = _severity_counts(context)
+            documents.append({
+                "document_info": context.document_info.to_dict(),
+                "is_valid": context.validation_summary.is_valid,
+                "issues": len(context.validation_issues),
+                "errors": error_count,
+                "warnings": warning_count
+            })
+        
+        prompt = BATCH_PROMPT.format_map({"documents": _dumps(documents)})
+        response = await self._call_groq_api(prompt, max_tokens=self.batch_max_tokens)
+        
+        try:
+            results = _loads(response)
+        except json.JSONDecodeError:
+            results = _embedded_json_list(response)
+        
+        if not isinstance(results, list) or len(results) != len(contexts):
+            return None
+        return [_combined_result(result) for result in results]
+    
+    async def _detect_anomalies_safe(self, context: AnalysisContext) -> List[str]:
         """Safely detect anomalies with error handling."""
         try:
             return await self._detect_anomalies(context)
@@ -315,7 +740,7 @@ class EDIAIAnalyzer:
             logger.warning(f"Anomaly detection failed: {str(e)}")
             return ["AI anomaly detection temporarily unavailable"]
     
-    async def _analyze_patterns_safe(self, context: Dict[str, Any]) -> Dict[str, Any]:
+    async def _analyze_patterns_safe(self, context: AnalysisContext) -> Dict[str, Any]:
         """Safely analyze patterns with error handling."""
         try:
             return await self._analyze_patterns(context)
@@ -323,7 +748,7 @@ class EDIAIAnalyzer:
             logger.warning(f"Pattern analysis failed: {str(e)}")
             return {"analysis_type": "rule_based", "error": str(e)}
     
-    async def _suggest_improvements_safe(self, context: Dict[str, Any]) -> List[str]:
+    async def _suggest_improvements_safe(self, context: AnalysisContext) -> List[str]:
         """Safely generate suggestions with error handling."""
         try:
             return await self._suggest_improvements(context)
@@ -331,120 +756,85 @@ class EDIAIAnalyzer:
             logger.warning(f"Suggestion generation failed: {str(e)}")
             return ["Review document structure and validation results"]
     
-    async def _assess_risk_safe(self, context: Dict[str, Any]) -> str:
+    async def _assess_risk_safe(self, context: AnalysisContext) -> str:
         """Safely assess risk with error handling."""
         try:
             return await self._assess_risk(context)
         except Exception as e:
             logger.warning(f"Risk assessment failed: {str(e)}")
             # Fallback risk assessment
-            issues = context.get('validation_issues', [])
-            error_count = sum(1 for issue in issues if issue.get('level') in ['error', 'critical'])
+            error_count, _ = _severity_counts(context)
             return "high" if error_count > 5 else "medium" if error_count > 2 else "low"
     
-    async def _detect_anomalies(self, context: Dict[str, Any]) -> List[str]:
+    async def _detect_anomalies(self, context: AnalysisContext) -> List[str]:
         """Use AI to detect anomalies in the EDI document."""
-        prompt = f"""
-        Analyze this X12 278 EDI document for anomalies and issues:
-        
-        Document Info: {json.dumps(context.get('document_info', {}), indent=2)}
-        Validation Issues: {len(context.get('validation_issues', []))} issues found
-        
-        Identify potential problems with:
-        1. Document structure
-        2. Data consistency  
-        3. Compliance issues
-        4. Unusual patterns
-        
-        Respond with a JSON array of specific anomaly descriptions (max 5):
-        ["anomaly1", "anomaly2", ...]
-        """
+        prompt = ANOMALY_PROMPT.format_map({
+            "document_info": _compact(context.document_info.to_dict()),
+            "issue_count": len(context.validation_issues)
+        })
         
         response = await self._call_groq_api(prompt)
         
         try:
             # Try to parse as JSON first
-            anomalies = json.loads(response)
+            anomalies = _loads(response)
             if isinstance(anomalies, list):
                 return [str(a) for a in anomalies[:5]]
         except json.JSONDecodeError:
             # Extract from response text if JSON parsing fails
-            lines = response.strip().split('\n')
-            anomalies = []
-            for line in lines:
-                line = line.strip()
-                if line and (line.startswith(('-', '*', '•')) or len(line) > 20):
-                    clean_line = line.lstrip('-*• ').strip()
-                    if clean_line:
-                        anomalies.append(clean_line)
-            return anomalies[:5]
+            anomalies = _embedded_json_list(response)
+            if anomalies is not None:
+                return [str(a) for a in anomalies[:5]]
+            return _reply_lines(response, 20)[:5]
         
         return ["AI analysis completed successfully"]
     
-    async def _analyze_patterns(self, context: Dict[str, Any]) -> Dict[str, Any]:
+    async def _analyze_patterns(self, context: AnalysisContext) -> Dict[str, Any]:
         """Analyze data patterns in the EDI document."""
-        prompt = f"""
-        Analyze patterns in this X12 278 EDI document:
-        
-        Document segments: {context.get('document_info', {}).get('total_segments', 0)}
-        Validation status: {context.get('validation_summary', {}).get('is_valid', False)}
-        
-        Provide a brief analysis of:
-        1. Document quality
-        2. Structure compliance
-        3. Processing confidence
-        
-        Respond with JSON: {{"quality": "high/medium/low", "structure": "description", "confidence": 0.0-1.0}}
-        """
+        prompt = PATTERN_PROMPT.format_map({
+            "total_segments": context.document_info.total_segments,
+            "is_valid": context.validation_summary.is_valid
+        })
         
         response = await self._call_groq_api(prompt)
         
         try:
-            result = json.loads(response)
+            result = _loads(response)
             if isinstance(result, dict):
                 return result
         except json.JSONDecodeError:
             pass
         
         # Fallback analysis
-        issues_count = len(context.get('validation_issues', []))
+        issues_count = len(context.validation_issues)
         return {
             "quality": "high" if issues_count == 0 else "medium" if issues_count < 5 else "low",
             "structure": "AI analysis completed",
             "confidence": 0.8 if issues_count == 0 else 0.6
         }
     
-    async def _suggest_improvements(self, context: Dict[str, Any]) -> List[str]:
+    async def _suggest_improvements(self, context: AnalysisContext) -> List[str]:
         """Generate improvement suggestions."""
-        issues_count = len(context.get('validation_issues', []))
-        
-        prompt = f"""
-        Based on this X12 278 EDI analysis with {issues_count} validation issues, suggest specific improvements:
+        issues_count = len(context.validation_issues)
         
-        Document: {context.get('document_info', {}).get('total_segments', 0)} segments
-        Valid: {context.get('validation_summary', {}).get('is_valid', False)}
-        
-        Provide 3-5 specific, actionable suggestions as a JSON array:
-        ["suggestion1", "suggestion2", ...]
-        """
+        prompt = SUGGESTION_PROMPT.format_map({
+            "issue_count": issues_count,
+            "total_segments": context.document_info.total_segments,
+            "is_valid": context.validation_summary.is_valid
+        })
         
         response = await self._call_groq_api(prompt)
         
         try:
-            suggestions = json.loads(response)
+            suggestions = _loads(response)
             if isinstance(suggestions, list):
                 return [str(s) for s in suggestions[:8]]
         except json.JSONDecodeError:
             # Extract suggestions from response text
-            lines = response.strip().split('\n')
-            suggestions = []
-            for line in lines:
-                line = line.strip()
-                if line and (line.startswith(('-', '*', '•')) or len(line) > 25):
-                    clean_line = line.lstrip('-*• ').strip()
-                    if clean_line:
-                        suggestions.append(clean_line)
-            return suggestions[:8]
+            suggestions = _embedded_json_list(response)
+            if suggestions is not None:
+                return [str(s) for s in suggestions[:8]]
+            return _reply_lines(response, 25)[:8]
         
         # Fallback suggestions
         base_suggestions = [
@@ -458,16 +848,14 @@ class EDIAIAnalyzer:
         
         return base_suggestions
     
-    async def _assess_risk(self, context: Dict[str, Any]) -> str:
+    async def _assess_risk(self, context: AnalysisContext) -> str:
         """Assess overall risk level of the EDI document."""
         try:
             # AI-enhanced risk assessment
-            issues = context.get('validation_issues', [])
-            error_count = sum(1 for issue in issues if issue.get('level') in ['error', 'critical'])
-            warning_count = sum(1 for issue in issues if issue.get('level') == 'warning')
+            error_count, warning_count = _severity_counts(context)
             
             # Rule-based assessment as baseline
-            if error_count > 5 or not context.get('validation_summary', {}).get('tr3_compliance', True):
+            if error_count > 5 or not context.validation_summary.tr3_compliance:
                 baseline_risk = "high"
             elif error_count > 2 or warning_count > 5:
                 baseline_risk = "medium"
@@ -476,20 +864,17 @@ class EDIAIAnalyzer:
             
             # Try AI enhancement
             try:
-                prompt = f"""
-                Assess the risk level for this X12 278 EDI document:
-                - Errors: {error_count}
-                - Warnings: {warning_count}
-                - Valid: {context.get('validation_summary', {}).get('is_valid', False)}
-                
-                Respond with only one word: "low", "medium", or "high"
-                """
+                prompt = RISK_PROMPT.format_map({
+                    "error_count": error_count,
+                    "warning_count": warning_count,
+                    "is_valid": context.validation_summary.is_valid
+                })
                 
-                response = await self._call_groq_api(prompt)
-                ai_risk = response.strip().lower()
+                response = await self._call_groq_api(prompt, stream=True, stop_on=_RISK_RE)
+                match = _RISK_RE.match(response)
                 
-                if ai_risk in ['low', 'medium', 'high']:
-                    return ai_risk
+                if match:
+                    return match.group(1).lower()
                     
             except Exception:
                 pass
@@ -500,62 +885,113 @@ class EDIAIAnalyzer:
             logger.warning(f"Risk assessment failed: {str(e)}")
             return "medium"  # Safe default
     
-    async def _call_groq_api(self, prompt: str) -> str:
-        """Call Groq API with comprehensive error handling."""
-        if not self.groq_client:
+    async def _call_groq_api(self, prompt: str, max_tokens: Optional[int] = None,
+                             stream: bool = False, stop_on: Optional[Pattern] = None) -> str:
+        """
+        Call Groq API with comprehensive error handling.
+        
+        Args:
+            prompt: User prompt
+            max_tokens: Completion limit (defaults to self.max_tokens)
+            stream: Accumulate the reply from streamed chunks
+            stop_on: When streaming, stop reading once this pattern matches the start of the reply
+        """
+        max_tokens = max_tokens or self.max_tokens
+        if not self.ai_available:
             raise AIAnalysisError("Groq AI client not initialized")
         
-        try:
-            # Make the API call with proper error handling
-            response = self.groq_client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are an expert EDI analyst specializing in X12 278 healthcare transactions. Provide accurate, concise analysis in the requested format. Be specific and helpful."
-                    },
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                top_p=0.9
-            )
-            
-            content = response.choices[0].message.content.strip()
-            logger.debug(f"Groq API response: {content[:100]}...")
-            return content
-            
-        except Exception as e:
-            error_msg = str(e).lower()
-            
-            # Handle specific error types
-            if "rate_limit" in error_msg or "429" in error_msg:
+        cache_key = None
+        if self.temperature <= CACHEABLE_TEMPERATURE:
+            cache_key = hashlib.sha256(_dumps(
+                {"m": self.model, "t": self.temperature, "n": max_tokens, "p": prompt, "sys": SYSTEM_PROMPT}
+            ).encode()).hexdigest()
+            cached = await _response_cache.get(cache_key)
+            if cached is not None:
+                logger.debug("Groq API response served from cache")
+                return cached
+        
+        # groq is imported lazily; a client exists by now, so this is a sys.modules lookup
+        from groq import APIConnectionError, APIStatusError, AuthenticationError, RateLimitError
+        
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            # Wait for capacity up front rather than spending a round trip on a 429
+            await _rate_limiter.acquire(len(prompt) // 4 + max_tokens)
+            try:
+                content = await self._request_completion(prompt, max_tokens, stream, stop_on)
+                logger.debug(f"Groq API response: {content[:100]}...")
+                if cache_key is not None:
+                    await _response_cache.set(cache_key, content)
+                return content
+                
+            except RateLimitError as e:
+                if attempt < RATE_LIMIT_RETRIES:
+                    delay = _retry_after(e, attempt) + random.uniform(0, 0.5)
+                    logger.warning(f"⚠️ Groq API rate limit hit, retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                    continue
                 logger.warning("⚠️ Groq API rate limit exceeded")
                 raise AIAnalysisError("AI API rate limit exceeded - please try again later")
-            elif "401" in error_msg or "invalid" in error_msg and "key" in error_msg:
+            except AuthenticationError:
                 logger.error("❌ Invalid Groq API key")
                 raise AIAnalysisError("Invalid AI API key - please check your configuration")
-            elif "quota" in error_msg:
-                logger.warning("⚠️ Groq API quota exceeded")
-                raise AIAnalysisError("AI API quota exceeded - please upgrade your plan")
-            else:
-                logger.error(f"Groq API call failed: {error_msg}")
-                raise AIAnalysisError(f"AI API call failed: {error_msg}")
+            except APIStatusError as e:
+                logger.error(f"Groq API returned HTTP {e.status_code}: {e.message}")
+                raise AIAnalysisError(f"AI API call failed: HTTP {e.status_code}")
+            except APIConnectionError as e:
+                logger.error(f"Groq API connection failed: {e}")
+                raise AIAnalysisError("AI API connection failed - please check your network")
+            except Exception as e:
+                logger.error(f"Groq API call failed: {e}")
+                raise AIAnalysisError(f"AI API call failed: {e}")
+    
+    async def _request_completion(self, prompt: str, max_tokens: int,
+                                  stream: bool, stop_on: Optional[Pattern]) -> str:
+        """Send one chat completion request and return the reply text."""
+        # The async client keeps the event loop free during the round trip
+        create = self._chat_create()
+        response = await create(
+            model=self.model,
+            messages=[
+                SYSTEM_MSG,
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=max_tokens,
+            temperature=self.temperature,
+            top_p=0.9,
+            stream=stream
+        )
+        
+        if not stream:
+            return response.choices[0].message.content.strip()
+        
+        parts = []
+        try:
+            async for chunk in response:
+                parts.append(chunk.choices[0].delta.content or "")
+                # Abort the rest of the generation once the answer is known
+                if stop_on and stop_on.match("".join(parts)):
+                    break
+        finally:
+            await response.close()
+        return "".join(parts).strip()
     
     def _calculate_confidence_score(self, validation_result: ValidationResult,
-                                  anomalies: List[str], patterns: Dict[str, Any]) -> float:
+                                  anomalies: List[str], patterns: Dict[str, Any],
+                                  counts: Optional[Counter] = None) -> float:
         """Calculate confidence score for the analysis."""
         try:
+            is_valid = validation_result.is_valid
+            segments = validation_result.segments_validated
+            
             # Start with a higher base score for valid documents
-            base_score = 0.85 if validation_result.is_valid else 0.65
+            base_score = 0.85 if is_valid else 0.65
             
             # Count different types of issues
-            critical_count = sum(1 for issue in validation_result.issues 
-                               if issue.level == ValidationLevel.CRITICAL)
-            error_count = sum(1 for issue in validation_result.issues 
-                            if issue.level == ValidationLevel.ERROR)
-            warning_count = sum(1 for issue in validation_result.issues 
-                              if issue.level == ValidationLevel.WARNING)
+            if counts is None:
+                counts = _issue_counts(validation_result)
+            critical_count = counts[_CRIT]
+            error_count = counts[_ERR]
+            warning_count = counts[_WARN]
             
             # More optimistic adjustments for good documents
             if critical_count == 0 and error_count == 0:
@@ -577,8 +1013,8 @@ class EDIAIAnalyzer:
             ai_bonus = 0.05 if self.is_available else 0.0
             
             # Successfully parsed document bonus (very important!)
-            if validation_result.segments_validated > 0:
-                parsing_bonus = 0.1 + (min(validation_result.segments_validated, 20) * 0.005)
+            if segments > 0:
+                parsing_bonus = 0.1 + (min(segments, 20) * 0.005)
             else:
                 parsing_bonus = -0.15
             
@@ -587,11 +1023,11 @@ class EDIAIAnalyzer:
                           ai_bonus + parsing_bonus - anomaly_penalty)
             
             # Ensure reasonable scoring for successfully parsed documents
-            if validation_result.segments_validated > 0:
+            if segments > 0:
                 final_score = max(0.5, final_score)  # Minimum 50% for parsed docs
                 
             # If it's a valid document with good parsing, ensure high confidence
-            if validation_result.is_valid and validation_result.segments_validated >= 5:
+            if is_valid and segments >= 5:
                 final_score = max(0.75, final_score)  # Minimum 75% for valid, well-parsed docs
             
             return max(0.0, min(1.0, final_score))
@@ -604,6 +1040,18 @@ class EDIAIAnalyzer:
             return 0.6  # Conservative but reasonable default
 
 
+_shared_analyzer: Optional[EDIAIAnalyzer] = None
+
+
+def get_analyzer() -> EDIAIAnalyzer:
+    """Shared analyzer, so the API key lookup and connection pools are set up once per process."""
+    global _shared_analyzer
+    # Rebuild an analyzer that started without a key once one becomes available
+    if _shared_analyzer is None or (GROQ_AVAILABLE and not _shared_analyzer.is_available and _resolve_groq_key()):
+        _shared_analyzer = EDIAIAnalyzer()
+    return _shared_analyzer
+
+
 class SmartEDIValidator:
     """Enhanced validator with AI-powered suggestions."""
     
@@ -627,36 +1075,62 @@ class SmartEDIValidator:
             # Get AI analysis if available
             if self.ai_analyzer.is_available:
                 ai_analysis = await self.ai_analyzer.analyze_edi(parsed_edi, validation_result)
-                
-                # Add AI-detected issues to validation result
-                ai_issues = []
-                for anomaly in ai_analysis.anomalies_detected:
-                    ai_issues.append(ValidationIssue(
-                        level=ValidationLevel.INFO,
-                        code="AI001",
-                        message=f"AI detected: {anomaly}",
-                        suggested_fix="Review and validate this finding"
-                    ))
-                
-                # Enhance suggestions
-                enhanced_suggestions = validation_result.suggested_improvements.copy()
-                enhanced_suggestions.extend(ai_analysis.suggested_fixes)
-                
-                # Create enhanced validation result
-                enhanced_result = ValidationResult(
-                    is_valid=validation_result.is_valid,
-                    issues=validation_result.issues + ai_issues,
-                    segments_validated=validation_result.segments_validated,
-                    validation_time=validation_result.validation_time,
-                    tr3_compliance=validation_result.tr3_compliance,
-                    suggested_improvements=enhanced_suggestions
-                )
-                
-                return enhanced_result
+                return self._merge_analysis(validation_result, ai_analysis)
             else:
                 # Return original if AI not available
                 return validation_result
             
         except Exception as e:
             logger.error(f"Enhanced validation failed: {str(e)}")
-            return validation_result  # Return original on failure
\ No newline at end of file
+            return validation_result  # Return original on failure
+    
+    async def enhanced_validate_many(self, items: List[tuple]) -> List[ValidationResult]:
+        """
+        Enhance several validations, sharing batched AI requests across documents.
+        
+        Args:
+            items: (parsed_edi, validation_result) pairs
+            
+        Returns:
+            List[ValidationResult]: Enhanced validation per item, in order
+        """
+        if not self.ai_analyzer.is_available:
+            return [validation_result for _, validation_result in items]
+        
+        try:
+            analyses = await self.ai_analyzer.analyze_many(items)
+        except Exception as e:
+            logger.error(f"Enhanced validation failed: {str(e)}")
+            return [validation_result for _, validation_result in items]
+        
+        return [
+            self._merge_analysis(validation_result, ai_analysis)
+            for (_, validation_result), ai_analysis in zip(items, analyses)
+        ]
+    
+    @staticmethod
+    def _merge_analysis(validation_result: ValidationResult, ai_analysis: AIAnalysis) -> ValidationResult:
+        """Copy of validation_result with the AI anomalies added as issues and its suggestions appended."""
+        # Add AI-detected issues to validation result
+        ai_issues = []
+        for anomaly in ai_analysis.anomalies_detected:
+            ai_issues.append(ValidationIssue(
+                level=ValidationLevel.INFO,
+                code="AI001",
+                message=f"AI detected: {anomaly}",
+                suggested_fix="Review and validate this finding"
+            ))
+        
+        # Enhance suggestions
+        enhanced_suggestions = validation_result.suggested_improvements.copy()
+        enhanced_suggestions.extend(ai_analysis.suggested_fixes)
+        
+        # Create enhanced validation result
+        return ValidationResult(
+            is_valid=validation_result.is_valid,
+            issues=validation_result.issues + ai_issues,
+            segments_validated=validation_result.segments_validated,
+            validation_time=validation_result.validation_time,
+            tr3_compliance=validation_result.tr3_compliance,
+            suggested_improvements=enhanced_suggestions
+        )
@@ -1,15 +1,34 @@
 """FastAPI application for EDI X12 278 processing microservice."""
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Depends
-from fastapi.responses import FileResponse, PlainTextResponse
+from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Depends, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import asyncio
-import shutil
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 import uuid
 
+import aiofiles
+
+# APScheduler is optional; without it cleanup falls back to a plain asyncio loop
+try:
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+    HAS_APSCHEDULER = True
+except ImportError:
+    HAS_APSCHEDULER = False
+
+# orjson is optional; without it dict payloads go through the stock JSONResponse
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 from ..config import settings, ensure_directories
 from ..core.models import (
     EDIFileUpload, EDIProcessingResponse, ProcessingJob, 
@@ -21,6 +40,37 @@ from ..core.logger import get_logger
 
 logger = get_logger(__name__)
 
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB per read/write while saving uploads
+DOWNLOAD_CHUNK_SIZE = 1 << 16  # 64 KiB slices when streaming exports
+_ALLOWED_SUFFIXES = ('.edi', '.txt', '.x12')  # matched against the lowercased upload filename
+
+# Export formats with their response content types and download file extensions
+_EXPORT_FORMATS = frozenset({"json", "xml", "edi", "validation"})
+_CONTENT_TYPE_MAP = {
+    "json": "application/json",
+    "xml": "application/xml",
+    "edi": "text/plain",
+    "validation": "application/json"
+}
+_EXTENSION_MAP = {
+    "json": "json",
+    "xml": "xml",
+    "edi": "edi",
+    "validation": "json"
+}
+
+# /jobs status filter values; unknown values are rejected with 400
+_STATUS_BY_VALUE = {status.value: status for status in ProcessingStatus}
+
+# Encoded exports per (job_id, format), reused while the job's completed_at is unchanged.
+# Bounded by entry count and by total bytes; exports over the per-entry cap are never cached.
+# Only touched from the event loop thread with no await between a lookup and its update, so no lock.
+EXPORT_CACHE_SIZE = 128
+EXPORT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+EXPORT_CACHE_ENTRY_MAX_BYTES = 8 * 1024 * 1024
+_export_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_export_cache_bytes = 0
+
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.app_name,
@@ -42,9 +92,6 @@ app.add_middleware(
 # Initialize the processing service
 processor = EDIProcessingService()
 
-# Ensure required directories exist
-ensure_directories()
-
 # Mount static files if they exist
 static_path = Path("static")
 if static_path.exists():
@@ -58,18 +105,88 @@ async def startup_event():
     logger.info(f"Debug mode: {settings.debug}")
     logger.info(f"AI analysis: {'enabled' if settings.groq_api_key else 'disabled'}")
     
-    # Start background cleanup task
-    asyncio.create_task(periodic_cleanup())
+    # Ensure required directories exist; makedirs runs off the event loop
+    await asyncio.to_thread(ensure_directories)
+    
+    # Schedule hourly cleanup; one run at a time, and missed runs collapse into one
+    if HAS_APSCHEDULER:
+        scheduler = AsyncIOScheduler()
+        scheduler.add_job(processor.cleanup_old_jobs, "interval", hours=1, max_instances=1, coalesce=True)
+        scheduler.start()
+        app.state.scheduler = scheduler
+    else:
+        app.state.cleanup_task = asyncio.create_task(periodic_cleanup())
+    
+    _job_slots()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Application shutdown tasks."""
     logger.info("Shutting down EDI X12 278 Processing Microservice")
+    scheduler = getattr(app.state, "scheduler", None)
+    if scheduler is not None:
+        scheduler.shutdown(wait=False)
+    cleanup_task = getattr(app.state, "cleanup_task", None)
+    if cleanup_task is not None:
+        cleanup_task.cancel()
+    await processor.ai_analyzer.aclose()
+
+
+def _json_response(content) -> Response:
+    """
+    Serialize a plain dict payload in one pass.
+    
+    Returning a dict makes FastAPI walk it with jsonable_encoder before encoding;
+    orjson handles the enums and datetimes in these payloads natively. Anything it
+    cannot encode (e.g. a Decimal inside FHIR resource data) takes the stock path.
+    """
+    if HAS_ORJSON:
+        try:
+            return Response(content=orjson.dumps(content), media_type="application/json")
+        except TypeError:
+            pass
+    return JSONResponse(jsonable_encoder(content))
+
+
+async def _cached_export(job_id: str, format: str) -> Optional[bytes]:
+    """processor.export_results as UTF-8 bytes, reusing the encoded output of finished jobs."""
+    global _export_cache_bytes
+    job = processor.get_job(job_id)
+    if job is None:
+        return None
+    
+    # Only finished jobs are cached; a running job's results can still change
+    stamp = job.completed_at
+    key = (job_id, format)
+    cached = _export_cache.get(key)
+    if cached is not None and stamp is not None and cached[0] == stamp:
+        _export_cache.move_to_end(key)
+        return cached[1]
+    
+    content = await processor.export_results(job_id, format)
+    if content is None:
+        return None
+    content = content.encode("utf-8")
+    if stamp is not None and len(content) <= EXPORT_CACHE_ENTRY_MAX_BYTES:
+        _drop_export(key)
+        _export_cache[key] = (stamp, content)
+        _export_cache_bytes += len(content)
+        while len(_export_cache) > EXPORT_CACHE_SIZE or _export_cache_bytes > EXPORT_CACHE_MAX_BYTES:
+            _drop_export(next(iter(_export_cache)))
+    return content
+
+
+def _drop_export(key: tuple) -> None:
+    """Remove one cached export, if present, keeping the byte total in step."""
+    global _export_cache_bytes
+    cached = _export_cache.pop(key, None)
+    if cached is not None:
+        _export_cache_bytes -= len(cached[1])
 
 
 async def periodic_cleanup():
-    """Periodic cleanup of old jobs."""
+    """Periodic cleanup of old jobs (used when APScheduler is not installed)."""
     while True:
         try:
             await asyncio.sleep(3600)  # Run every hour
@@ -79,21 +196,25 @@ async def periodic_cleanup():
 
 
 # Health Check Endpoints
+@lru_cache(maxsize=2)
+def _health_static(ai_enabled: bool) -> dict:
+    """HealthCheck fields other than status and timestamp; built once per AI analyzer state."""
+    return {
+        "version": settings.app_version,
+        "components": {
+            "parser": "healthy",
+            "validator": "healthy",
+            "fhir_mapper": "healthy",
+            "ai_analyzer": "healthy" if ai_enabled else "disabled"
+        }
+    }
+
+
 @app.get("/health", response_model=HealthCheck)
 async def health_check():
     """Health check endpoint."""
-    components = {
-        "parser": "healthy",
-        "validator": "healthy",
-        "fhir_mapper": "healthy",
-        "ai_analyzer": "healthy" if processor.ai_analyzer else "disabled"
-    }
-    
-    return HealthCheck(
-        status="healthy",
-        version=settings.app_version,
-        components=components
-    )
+    static = _health_static(processor.ai_analyzer.is_available)
+    return _json_response({"status": "healthy", "timestamp": datetime.utcnow(), **static})
 
 
 @app.get("/stats", response_model=EDIStatistics)
@@ -126,7 +247,7 @@ async def upload_edi_file(
         if not file.filename:
             raise HTTPException(status_code=400, detail="No file provided")
         
-        if not file.filename.endswith(('.edi', '.txt', '.x12')):
+        if not file.filename.lower().endswith(_ALLOWED_SUFFIXES):
             raise HTTPException(
                 status_code=400, 
                 detail="Invalid file type. Only .edi, .txt, and .x12 files are supported"
@@ -143,11 +264,13 @@ async def upload_edi_file(
         file_id = str(uuid.uuid4())
         file_path = Path(settings.upload_dir) / f"{file_id}_{file.filename}"
         
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Stream to disk in chunks so concurrent uploads don't block the event loop
+        async with aiofiles.open(file_path, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                await buffer.write(chunk)
         
-        # Create upload request
-        upload_request = EDIFileUpload(
+        # Create upload request (parameters are already validated by FastAPI)
+        upload_request = EDIFileUpload.model_construct(
             filename=file.filename,
             content_type=file.content_type or "text/plain",
             validate_only=validate_only,
@@ -164,7 +287,7 @@ async def upload_edi_file(
         
         # Create initial response
         job_id = str(uuid.uuid4())
-        return EDIProcessingResponse(
+        return EDIProcessingResponse.model_construct(
             job_id=job_id,
             status=ProcessingStatus.PENDING,
             message="File uploaded successfully. Processing started.",
@@ -207,7 +330,7 @@ async def process_edi_content(request: ProcessEDIRequest):
             )
         
         # Create upload request
-        upload_request = EDIFileUpload(
+        upload_request = EDIFileUpload.model_construct(
             filename=request.filename,
             content_type="text/plain",
             validate_only=request.validate_only,
@@ -218,24 +341,7 @@ async def process_edi_content(request: ProcessEDIRequest):
         # Process content
         job = await processor.process_content(request.content, upload_request)
         
-        # Create response
-        response = EDIProcessingResponse(
-            job_id=job.job_id,
-            status=job.status,
-            message="Processing completed" if job.status == ProcessingStatus.COMPLETED 
-                   else f"Processing failed: {job.error_message}",
-        )
-        
-        # Add validation summary
-        if job.validation_result:
-            response.validation_summary = {
-                "is_valid": job.validation_result.is_valid,
-                "tr3_compliance": job.validation_result.tr3_compliance,
-                "issues_count": len(job.validation_result.issues),
-                "processing_time": job.processing_time
-            }
-        
-        return response
+        return _processing_response(job)
         
     except HTTPException:
         raise
@@ -244,6 +350,132 @@ async def process_edi_content(request: ProcessEDIRequest):
         raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
 
 
+@app.post("/process/stream", response_model=EDIProcessingResponse)
+async def process_edi_stream(
+    request: Request,
+    filename: str = "content.edi",
+    validate_only: bool = False,
+    enable_ai_analysis: bool = True,
+    output_format: str = "fhir"
+):
+    """
+    Process a raw EDI request body (e.g. Content-Type: application/x-edi).
+    
+    The body is read as it arrives, without a JSON envelope, and rejected as soon as
+    it exceeds the size limit. Processing options are query parameters.
+    """
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > settings.max_file_size:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Content too large. Maximum size: {settings.max_file_size} bytes"
+            )
+    
+    try:
+        content = body.decode("utf-8")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="EDI content must be UTF-8 text")
+    del body
+    
+    if not content.strip():
+        raise HTTPException(status_code=400, detail="No content provided")
+    
+    try:
+        upload_request = EDIFileUpload.model_construct(
+            filename=filename,
+            content_type=request.headers.get("content-type", "text/plain"),
+            validate_only=validate_only,
+            enable_ai_analysis=enable_ai_analysis,
+            output_format=output_format
+        )
+        job = await processor.process_content(content, upload_request)
+        return _processing_response(job)
+        
+    except Exception as e:
+        logger.error(f"Content processing failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
+
+
+@app.post("/process/batch", response_model=List[EDIProcessingResponse])
+async def process_edi_batch(requests: List[ProcessEDIRequest]):
+    """
+    Process several EDI documents concurrently.
+    
+    Args:
+        requests: ProcessEDIRequest per document; responses are returned in the same order
+    """
+    if len(requests) > settings.max_batch_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many documents in batch. Maximum: {settings.max_batch_items}"
+        )
+    
+    for request in requests:
+        if not request.content.strip():
+            raise HTTPException(status_code=400, detail=f"No content provided for {request.filename}")
+        if len(request.content) > settings.max_file_size:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Content too large for {request.filename}. Maximum size: {settings.max_file_size} bytes"
+            )
+    
+    uploads = [
+        (
+            request.content,
+            EDIFileUpload.model_construct(
+                filename=request.filename,
+                content_type="text/plain",
+                validate_only=request.validate_only,
+                enable_ai_analysis=request.enable_ai_analysis,
+                output_format=request.output_format
+            )
+        )
+        for request in requests
+    ]
+    
+    try:
+        # The AI steps run once for the whole batch; parsing, validation and FHIR mapping
+        # share the app-wide job slots with every other batch request
+        jobs = await processor.process_many(uploads, slots=_job_slots())
+    except Exception as e:
+        logger.error(f"Batch processing failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Batch processing failed: {str(e)}")
+    
+    return [_processing_response(job) for job in jobs]
+
+
+def _job_slots() -> asyncio.Semaphore:
+    """App-wide semaphore bounding concurrent batch documents to settings.max_concurrent_jobs."""
+    slots = getattr(app.state, "job_slots", None)
+    if slots is None:
+        # Created on first use so it belongs to the serving event loop
+        slots = app.state.job_slots = asyncio.Semaphore(settings.max_concurrent_jobs)
+    return slots
+
+
+def _processing_response(job: ProcessingJob) -> EDIProcessingResponse:
+    """EDIProcessingResponse for a finished job, with its validation summary when there is one."""
+    validation_summary = None
+    if job.validation_result:
+        validation_summary = {
+            "is_valid": job.validation_result.is_valid,
+            "tr3_compliance": job.validation_result.tr3_compliance,
+            "issues_count": len(job.validation_result.issues),
+            "processing_time": job.processing_time
+        }
+    
+    # Create response from values the service has already validated
+    return EDIProcessingResponse.model_construct(
+        job_id=job.job_id,
+        status=job.status,
+        message="Processing completed" if job.status == ProcessingStatus.COMPLETED 
+               else f"Processing failed: {job.error_message}",
+        validation_summary=validation_summary
+    )
+
+
 async def process_file_background(file_path: str, upload_request: EDIFileUpload):
     """Background task for file processing."""
     try:
@@ -252,8 +484,8 @@ async def process_file_background(file_path: str, upload_request: EDIFileUpload)
     except Exception as e:
         logger.error(f"Background processing failed: {str(e)}")
     finally:
-        # Clean up uploaded file
-        Path(file_path).unlink(missing_ok=True)
+        # Clean up uploaded file off the event loop
+        await asyncio.to_thread(Path(file_path).unlink, missing_ok=True)
 
 
 # Job Management Endpoints
@@ -269,19 +501,13 @@ async def get_job_status(job_id: str):
 @app.get("/jobs")
 async def list_jobs(limit: int = 50, status: Optional[str] = None):
     """List recent jobs with optional status filter."""
-    jobs = processor.get_all_jobs()
-    
-    # Filter by status if provided
-    if status:
-        try:
-            status_enum = ProcessingStatus(status)
-            jobs = {k: v for k, v in jobs.items() if v.status == status_enum}
-        except ValueError:
-            raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
+    status_enum = _STATUS_BY_VALUE.get(status) if status else None
+    if status and status_enum is None:
+        raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
     
-    # Sort by creation time (newest first) and limit
-    sorted_jobs = sorted(jobs.values(), key=lambda x: x.created_at, reverse=True)
-    return sorted_jobs[:limit]
+    # Newest first, limited, without sorting the whole job table
+    jobs = processor.recent_jobs(limit, status_enum)
+    return _json_response([job.model_dump() for job in jobs])
 
 
 @app.delete("/jobs/{job_id}")
@@ -291,6 +517,8 @@ async def delete_job(job_id: str):
         raise HTTPException(status_code=404, detail="Job not found")
     
     del processor.jobs[job_id]
+    for key in [key for key in _export_cache if key[0] == job_id]:
+        _drop_export(key)
     return {"message": "Job deleted successfully"}
 
 
@@ -304,34 +532,20 @@ async def export_results(job_id: str, format: str):
         job_id: Job identifier
         format: Export format (json, xml, edi, validation)
     """
-    if format not in ["json", "xml", "edi", "validation"]:
+    if format not in _EXPORT_FORMATS:
         raise HTTPException(
             status_code=400, 
             detail="Invalid format. Supported: json, xml, edi, validation"
         )
     
     try:
-        content = await processor.export_results(job_id, format)
+        content = await _cached_export(job_id, format)
         if content is None:
             raise HTTPException(status_code=404, detail="Job not found")
         
         # Determine content type and filename
-        content_type_map = {
-            "json": "application/json",
-            "xml": "application/xml",
-            "edi": "text/plain",
-            "validation": "application/json"
-        }
-        
-        file_extension_map = {
-            "json": "json",
-            "xml": "xml", 
-            "edi": "edi",
-            "validation": "json"
-        }
-        
-        content_type = content_type_map.get(format, "text/plain")
-        extension = file_extension_map.get(format, "txt")
+        content_type = _CONTENT_TYPE_MAP.get(format, "text/plain")
+        extension = _EXTENSION_MAP.get(format, "txt")
         filename = f"export_{job_id}.{extension}"
         
         # Return content directly for API
@@ -358,27 +572,23 @@ async def download_results(job_id: str, format: str):
         format: Export format (json, xml, edi, validation)
     """
     try:
-        content = await processor.export_results(job_id, format)
+        content = await _cached_export(job_id, format)
         if content is None:
             raise HTTPException(status_code=404, detail="Job not found")
         
-        # Create temporary file
-        file_extension_map = {
-            "json": "json",
-            "xml": "xml",
-            "edi": "edi", 
-            "validation": "json"
-        }
+        extension = _EXTENSION_MAP.get(format, "txt")
         
-        extension = file_extension_map.get(format, "txt")
-        temp_file = Path(settings.temp_dir) / f"download_{job_id}.{extension}"
+        # Stream the encoded export straight from memory; the slices are views, not copies
+        view = memoryview(content)
         
-        temp_file.write_text(content, encoding='utf-8')
+        async def iter_content():
+            for start in range(0, len(view), DOWNLOAD_CHUNK_SIZE):
+                yield view[start:start + DOWNLOAD_CHUNK_SIZE]
         
-        return FileResponse(
-            path=str(temp_file),
-            filename=f"edi_export_{job_id}.{extension}",
-            media_type="application/octet-stream"
+        return StreamingResponse(
+            iter_content(),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="edi_export_{job_id}.{extension}"'}
         )
         
     except EDIProcessingError as e:
@@ -405,7 +615,7 @@ async def validate_edi_content(request: ValidateEDIRequest):
         request: ValidateEDIRequest containing content and validation options
     """
     try:
-        upload_request = EDIFileUpload(
+        upload_request = EDIFileUpload.model_construct(
             filename=request.filename,
             content_type="text/plain",
             validate_only=True,
@@ -450,7 +660,7 @@ async def validate_edi_content(request: ValidateEDIRequest):
                 "pattern_analysis": job.ai_analysis.pattern_analysis
             }
         
-        return result
+        return _json_response(result)
         
     except HTTPException:
         raise
@@ -475,7 +685,7 @@ async def convert_to_fhir(request: ConvertToFHIRRequest):
         request: ConvertToFHIRRequest containing content and filename
     """
     try:
-        upload_request = EDIFileUpload(
+        upload_request = EDIFileUpload.model_construct(
             filename=request.filename,
             content_type="text/plain",
             validate_only=False,
@@ -494,8 +704,8 @@ async def convert_to_fhir(request: ConvertToFHIRRequest):
         if not job.fhir_mapping:
             raise HTTPException(status_code=500, detail="FHIR mapping failed")
         
-        # Return FHIR resources
-        return {
+        # Return FHIR resources; resource data is passed through to orjson as-is
+        return _json_response({
             "job_id": job.job_id,
             "mapping_version": job.fhir_mapping.mapping_version,
             "mapped_at": job.fhir_mapping.mapped_at,
@@ -508,7 +718,7 @@ async def convert_to_fhir(request: ConvertToFHIRRequest):
                 }
                 for resource in job.fhir_mapping.resources
             ]
-        }
+        })
         
     except HTTPException:
         raise
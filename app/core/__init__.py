@@ -1,52 +1,74 @@
 """Core EDI processing modules with error handling."""
 
-# Import core modules with error handling
+import importlib
+
+# Models and logging are light and needed by every caller; import them eagerly
 from .models import *
 from .logger import get_logger, configure_logging
-from .edi_parser import EDI278Parser, EDI278Validator
-
-# Try to import FHIR mapper with fallback
-try:
-    from .fhir_mapper import X12To278FHIRMapper, FHIRToX12Mapper, ProductionFHIRMapper
-except ImportError as e:
-    # Create fallback FHIR mappers
-    import warnings
-    warnings.warn(f"FHIR mapper not available: {e}")
-    
-    class FallbackFHIRMapper:
-        def __init__(self):
-            self.logger = get_logger(self.__class__.__name__)
-            self.logger.warning("Using fallback FHIR mapper - full FHIR functionality not available")
-        
-        def map_to_fhir(self, edi_data):
-            from .models import FHIRMapping, FHIRResource
-            return FHIRMapping(
-                resources=[
-                    FHIRResource(
-                        resource_type="OperationOutcome",
-                        data={
-                            "resourceType": "OperationOutcome",
-                            "issue": [{
-                                "severity": "warning",
-                                "code": "not-supported",
-                                "details": {"text": "FHIR library not available - using fallback"}
-                            }]
-                        }
-                    )
-                ]
-            )
-    
-    # Use fallback classes
-    X12To278FHIRMapper = FallbackFHIRMapper
-    FHIRToX12Mapper = FallbackFHIRMapper
-    ProductionFHIRMapper = FallbackFHIRMapper
+
+# Parser and FHIR mapper load on first attribute access (PEP 562), so importing
+# app.core (or any app.core submodule) does not pull in pyx12 or fhir.resources
+_LAZY_IMPORTS = {
+    'EDI278Parser': '.edi_parser',
+    'EDI278Validator': '.edi_parser',
+    'X12To278FHIRMapper': '.fhir_mapper',
+    'FHIRToX12Mapper': '.fhir_mapper',
+    'ProductionFHIRMapper': '.fhir_mapper',
+}
+
+
+class FallbackFHIRMapper:
+    """Stand-in for the FHIR mappers when the mapper module cannot be imported."""
+
+    def __init__(self):
+        self.logger = get_logger(self.__class__.__name__)
+        self.logger.warning("Using fallback FHIR mapper - full FHIR functionality not available")
+
+    def map_to_fhir(self, edi_data):
+        from .models import FHIRMapping, FHIRResource
+        return FHIRMapping(
+            resources=[
+                FHIRResource(
+                    resource_type="OperationOutcome",
+                    data={
+                        "resourceType": "OperationOutcome",
+                        "issue": [{
+                            "severity": "warning",
+                            "code": "not-supported",
+                            "details": {"text": "FHIR library not available - using fallback"}
+                        }]
+                    }
+                )
+            ]
+        )
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    try:
+        value = getattr(importlib.import_module(module_name, __name__), name)
+    except ImportError as e:
+        if module_name != '.fhir_mapper':
+            raise
+        # Use fallback classes
+        import warnings
+        warnings.warn(f"FHIR mapper not available: {e}")
+        value = FallbackFHIRMapper
+
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'EDI278Parser',
-    'EDI278Validator', 
+    'EDI278Validator',
     'X12To278FHIRMapper',
     'FHIRToX12Mapper',
     'ProductionFHIRMapper',
     'get_logger',
     'configure_logging'
-] 
\ No newline at end of file
+]
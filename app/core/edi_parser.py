@@ -1,11 +1,11 @@
 """Enhanced EDI X12 278 parser with robust error handling and fallback mechanisms."""
 
-import re
 import os
 import sys
 import time
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Union
+from functools import lru_cache
+from typing import Dict, Iterator, List, Any, Optional, Union
 from pathlib import Path
 
 from .models import ParsedEDI, EDIHeader, EDISegment, ValidationResult, ValidationIssue, ValidationLevel
@@ -55,6 +55,44 @@ class EDIParsingError(Exception):
     pass
 
 
+# Segments whose empty elements are positional and must be kept
+_KEEP_EMPTY_ELEMENTS = frozenset({'ISA', 'HL'})
+
+
+# ISA12 versions pyx12 cannot read, mapped to 4010 for compatibility
+_ISA_VERSION_MAP = {
+    '00501': '00401',  # Map 5010 to 4010 for pyx12 compatibility
+    '501': '00401',
+    '5010': '00401',
+    '00500': '00401',
+    '500': '00401'
+}
+
+
+@lru_cache(maxsize=1024)
+def _element_ref(segment_id: str, index: int) -> str:
+    """pyx12 element reference such as 'NM103'; built once per (segment, index)."""
+    return f"{segment_id}{index:02d}"
+
+
+def _iter_stripped_pieces(content: str, separator: Optional[str]) -> Iterator[str]:
+    """Yield the non-empty, stripped pieces of content between separators, left to right."""
+    if separator is None:
+        yield content
+        return
+    
+    step = len(separator)
+    start = 0
+    while True:
+        end = content.find(separator, start)
+        piece = (content[start:] if end == -1 else content[start:end]).strip()
+        if piece:
+            yield piece
+        if end == -1:
+            return
+        start = end + step
+
+
 class EDI278Parser:
     """Enhanced EDI X12 278 parser with multiple parsing strategies."""
     
@@ -159,7 +197,7 @@ class EDI278Parser:
         
         1. Enhanced pyx12 parsing (preferred)
         2. Simple pyx12 parsing
-        3. Manual regex parsing (fallback)
+        3. Manual delimiter-based parsing (fallback)
         """
         parsing_methods = [
             ("pyx12_enhanced", self._parse_with_pyx12),
@@ -316,17 +354,10 @@ class EDI278Parser:
                             version = parts[11]  # ISA12 - Interchange Control Version Number
                             
                             # Enhanced version mappings for pyx12 compatibility
-                            version_map = {
-                                '00501': '00401',  # Map 5010 to 4010 for pyx12 compatibility
-                                '501': '00401',
-                                '5010': '00401',
-                                '00500': '00401',
-                                '500': '00401'
-                            }
-                            
-                            if version in version_map:
-                                parts[11] = version_map[version]
-                                logger.info(f"ISA version mapping: {version} → {version_map[version]}")
+                            mapped_version = _ISA_VERSION_MAP.get(version)
+                            if mapped_version is not None:
+                                parts[11] = mapped_version
+                                logger.info(f"ISA version mapping: {version} → {mapped_version}")
                             
                             # Ensure ISA segment has proper formatting
                             # ISA*00*          *00*          *ZZ*SENDER_ID     *ZZ*RECEIVER_ID   *YYMMDD*HHMM*U*00401*000000001*0*P*>~
@@ -373,7 +404,6 @@ class EDI278Parser:
                 
                 processed_content = '\n'.join(processed_lines)
             
-            # Additional regex-based fixes for edge cases
             if processed_content != content.strip():
                 logger.info("✅ ISA version preprocessing completed for pyx12 compatibility")
             
@@ -394,7 +424,7 @@ class EDI278Parser:
                 if hasattr(seg, 'get_count'):
                     element_count = seg.get_count()
                     for i in range(1, element_count + 1):
-                        element_value = seg.get_value(f"{segment_id}{i:02d}")
+                        element_value = seg.get_value(_element_ref(segment_id, i))
                         if element_value:
                             elements.append(element_value)
                 elif hasattr(seg, 'get_elements'):
@@ -514,75 +544,16 @@ class EDI278Parser:
     
     def _parse_manually(self, content: str) -> Dict[str, Any]:
         """
-        Manual parsing using regex patterns as ultimate fallback.
+        Manual delimiter-based parsing as ultimate fallback.
         This method handles damaged or non-standard EDI files.
+        
+        Segments are found with str.find and split with str.split, both linear scans in C;
+        no regular expression is involved.
         """
         try:
             logger.info("Using manual parsing fallback")
             
-            # Split content into segments by various terminators
-            content = content.strip()
-            
-            # Try different segment separators
-            separators = ['~', '\n', '\r\n']
-            segments_raw = []
-            
-            for sep in separators:
-                if sep in content:
-                    segments_raw = [s.strip() for s in content.split(sep) if s.strip()]
-                    break
-            
-            if not segments_raw:
-                # If no separators found, treat as single segment
-                segments_raw = [content]
-            
-            segments = []
-            position = 0
-            
-            for segment_raw in segments_raw:
-                position += 1
-                
-                if not segment_raw or len(segment_raw) < 2:
-                    continue
-                
-                # Parse segment manually
-                if '*' in segment_raw:
-                    parts = segment_raw.split('*')
-                    tag = parts[0].strip()
-                    # For ISA and HL segments, preserve all elements including empty ones
-                    if tag in ['ISA', 'HL']:
-                        elements = [elem for elem in parts[1:]]  # Keep all elements for ISA and HL
-                    else:
-                        elements = [elem.strip() for elem in parts[1:] if elem.strip()]
-                    
-                    # Validate segment tag (should be 2-3 letters/numbers)
-                    if len(tag) >= 2 and tag.isalnum():
-                        segments.append({
-                            'tag': tag,
-                            'elements': elements,
-                            'raw': segment_raw,
-                            'position': position
-                        })
-                        
-                        logger.debug(f"Manual parsed: {tag} with {len(elements)} elements")
-                else:
-                    # Handle segments without '*' (malformed but try to salvage)
-                    cleaned_segment = segment_raw.strip()
-                    if len(cleaned_segment) >= 2:
-                        # Try to extract at least a segment ID
-                        tag = cleaned_segment[:3] if len(cleaned_segment) >= 3 else cleaned_segment
-                        if tag.isalnum():
-                            segments.append({
-                                'tag': tag,
-                                'elements': [],
-                                'raw': segment_raw,
-                                'position': position
-                            })
-                            logger.debug(f"Manual parsed malformed: {tag}")
-                
-                if position >= self.max_segments:
-                    logger.warning(f"Reached manual parsing segment limit: {self.max_segments}")
-                    break
+            segments = list(self._iter_segments_manual(content))
             
             if not segments:
                 raise EDIParsingError("Manual parsing produced no valid segments")
@@ -598,6 +569,70 @@ class EDI278Parser:
             logger.error(f"Manual parsing failed: {str(e)}")
             raise EDIParsingError(f"Manual parsing failed: {str(e)}")
     
+    def _iter_segments_manual(self, content: str) -> Iterator[Dict[str, Any]]:
+        """
+        Yield manually parsed segments one at a time.
+        
+        Segments are located with str.find from a moving offset, so no list of raw
+        segment strings is built next to the parsed segments.
+        """
+        # Split content into segments by various terminators
+        content = content.strip()
+        
+        # Try different segment separators
+        separator = next((sep for sep in ('~', '\n', '\r\n') if sep in content), None)
+        
+        position = 0
+        max_segments = self.max_segments
+        strip = str.strip
+        
+        # If no separators found, the whole content is treated as a single segment.
+        # The loop body runs once per segment, so element cleanup stays in C (map/filter)
+        # and there is no per-segment debug logging; the totals are logged by the caller.
+        for segment_raw in _iter_stripped_pieces(content, separator):
+            position += 1
+            
+            if not segment_raw or len(segment_raw) < 2:
+                continue
+            
+            # Parse segment manually
+            if '*' in segment_raw:
+                parts = segment_raw.split('*')
+                tag = parts[0].strip()
+                
+                # Validate segment tag (should be 2-3 letters/numbers)
+                if len(tag) >= 2 and tag.isalnum():
+                    del parts[0]
+                    # For ISA and HL segments, preserve all elements including empty ones
+                    if tag in _KEEP_EMPTY_ELEMENTS:
+                        elements = parts
+                    else:
+                        elements = list(filter(None, map(strip, parts)))
+                    
+                    yield {
+                        'tag': tag,
+                        'elements': elements,
+                        'raw': segment_raw,
+                        'position': position
+                    }
+            else:
+                # Handle segments without '*' (malformed but try to salvage)
+                cleaned_segment = segment_raw.strip()
+                if len(cleaned_segment) >= 2:
+                    # Try to extract at least a segment ID
+                    tag = cleaned_segment[:3] if len(cleaned_segment) >= 3 else cleaned_segment
+                    if tag.isalnum():
+                        yield {
+                            'tag': tag,
+                            'elements': [],
+                            'raw': segment_raw,
+                            'position': position
+                        }
+            
+            if position >= max_segments:
+                logger.warning(f"Reached manual parsing segment limit: {self.max_segments}")
+                return
+    
     def _convert_to_edi_segments(self, raw_segments: List[Dict[str, Any]]) -> List[EDISegment]:
         """Convert raw segment data to EDISegment objects."""
         edi_segments = []
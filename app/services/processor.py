@@ -3,10 +3,16 @@
 import asyncio
 import uuid
 import json
+import threading
 import time
+import weakref
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Union
+from hashlib import blake2b
+from itertools import islice
+from typing import Dict, List, Mapping, Optional, Any, Tuple, Union
 from pathlib import Path
+from types import MappingProxyType
 
 from ..core.edi_parser import EDI278Parser, EDI278Validator, ProductionTR3Validator
 from ..core.fhir_mapper import X12To278FHIRMapper, ProductionFHIRMapper, get_fhir_mapper
@@ -14,11 +20,19 @@ from ..core.models import (
     ParsedEDI, ValidationResult, FHIRMapping, AIAnalysis, ProcessingJob,
     EDIFileUpload, ProcessingStatus, ValidationLevel
 )
-from ..ai.analyzer import EDIAIAnalyzer, SmartEDIValidator
+from ..ai.analyzer import SmartEDIValidator, get_analyzer
 from ..core.logger import get_logger
+from ..config import settings
 
 logger = get_logger(__name__)
 
+# Parsed documents and their strict TR3 validation, keyed by a digest of the content.
+# Bounded by entry count and by the total size of the cached documents' raw content (the segment
+# dicts and validation results grow with it); larger documents are parsed every time.
+PARSE_CACHE_SIZE = 256
+PARSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+PARSE_CACHE_ENTRY_MAX_BYTES = 4 * 1024 * 1024
+
 
 def safe_model_dump(obj) -> Dict[str, Any]:
     """Safely convert Pydantic model to dict with fallback."""
@@ -52,12 +66,22 @@ class ProductionEDIProcessingService:
         self.production_validator = ProductionTR3Validator()  # Direct access for strict validation
         self.fhir_mapper = ProductionFHIRMapper()  # Production-grade FHIR mapper
         
-        # AI components (optional but recommended)
-        self.ai_analyzer = EDIAIAnalyzer()
+        # AI components (optional but recommended); the analyzer is shared across service instances
+        self.ai_analyzer = get_analyzer()
         self.smart_validator = SmartEDIValidator(self.ai_analyzer) if self.ai_analyzer.is_available else None
         
         # Job tracking and statistics
         self.jobs: Dict[str, ProcessingJob] = {}
+        
+        # Resubmitted content (client retries, duplicate uploads) skips parsing and strict validation.
+        # Entries are [ParsedEDI, ValidationResult or None, size]; the cached models are never mutated.
+        # The cache lives on the instance, so it only helps callers that reuse one service.
+        self._parse_cache: "OrderedDict[bytes, list]" = OrderedDict()
+        self._parse_cache_bytes = 0
+        self._parse_cache_lock = threading.Lock()
+        
+        # Bound on in-flight AI calls; one semaphore per event loop, like the analyzer's clients
+        self._ai_semaphores = weakref.WeakKeyDictionary()
         self.processing_stats = {
             'total_processed': 0,
             'successful': 0,
@@ -83,135 +107,290 @@ class ProductionEDIProcessingService:
         Returns:
             ProcessingJob: Complete processing results with strict validation
         """
-        job_id = str(uuid.uuid4())
-        job = ProcessingJob(
-            job_id=job_id,
-            filename=upload_request.filename,
-            status=ProcessingStatus.PENDING,
-            file_size=len(content.encode('utf-8'))
-        )
-        
-        self.jobs[job_id] = job
+        job, digest = self._new_job(content, upload_request)
+        job_id = job.job_id
         
         try:
-            logger.info(f"Starting production processing for job {job_id}")
-            job.status = ProcessingStatus.PROCESSING
-            job.started_at = datetime.utcnow()
-            
             start_time = time.time()
             error_details = []
             
             # Phase 1: EDI Parsing with comprehensive error handling
-            try:
-                logger.info(f"[{job_id}] Phase 1: EDI Parsing")
-                parsed_edi = await self._parse_edi_content_production(content, upload_request.filename)
-                job.parsed_edi = parsed_edi
-                logger.info(f"[{job_id}] ✅ Parsing successful: {len(parsed_edi.segments)} segments, method: {parsed_edi.parsing_method}")
-            except Exception as e:
-                error_msg = f"EDI parsing failed: {str(e)}"
-                error_details.append(error_msg)
-                logger.error(f"[{job_id}] ❌ {error_msg}")
-                job.error_message = error_msg
-                job.status = ProcessingStatus.FAILED
-                job.completed_at = datetime.utcnow()
-                self._update_stats(success=False, tr3_compliant=False)
+            parsed_edi = await self._parse_phase(job, content, upload_request, digest, error_details)
+            if parsed_edi is None:
                 return job
             
             # Phase 2: Production-grade TR3 Validation
             try:
                 logger.info(f"[{job_id}] Phase 2: Production TR3 Validation")
-                validation_result = await self._validate_edi_production(parsed_edi, upload_request)
-                job.validation_result = validation_result
-                
-                # Log validation results
-                critical_issues = [i for i in validation_result.issues if i.level == ValidationLevel.CRITICAL]
-                error_issues = [i for i in validation_result.issues if i.level == ValidationLevel.ERROR]
-                
-                logger.info(f"[{job_id}] Validation: Valid={validation_result.is_valid}, TR3={validation_result.tr3_compliance}")
-                logger.info(f"[{job_id}] Issues: {len(validation_result.issues)} total, {len(critical_issues)} critical, {len(error_issues)} errors")
-                
-                # Production rule: Fail processing if critical issues exist
-                if critical_issues:
-                    error_msg = f"Production validation failed: {len(critical_issues)} critical TR3 compliance issues"
-                    error_details.append(error_msg)
-                    logger.error(f"[{job_id}] ❌ {error_msg}")
-                    job.error_message = error_msg
-                    job.status = ProcessingStatus.FAILED
-                    job.completed_at = datetime.utcnow()
-                    self._update_stats(success=False, tr3_compliant=False)
-                    return job
-                
+                validation_result = await self._validate_edi_production(parsed_edi, upload_request, digest)
             except Exception as e:
-                error_msg = f"Production validation failed: {str(e)}"
-                error_details.append(error_msg)
-                logger.error(f"[{job_id}] ❌ {error_msg}")
-                job.error_message = error_msg
-                job.status = ProcessingStatus.FAILED
-                job.completed_at = datetime.utcnow()
-                self._update_stats(success=False, tr3_compliant=False)
+                return self._fail_job(job, f"Production validation failed: {str(e)}", error_details)
+            
+            if not self._accept_validation(job, validation_result, error_details):
                 return job
             
             # Phase 3: AI Analysis (if enabled and available)
             if upload_request.enable_ai_analysis and self.ai_analyzer.is_available:
-                try:
-                    logger.info(f"[{job_id}] Phase 3: AI Analysis")
-                    ai_analysis = await self._analyze_with_ai_production(parsed_edi, validation_result)
-                    job.ai_analysis = ai_analysis
-                    logger.info(f"[{job_id}] ✅ AI analysis completed: confidence={ai_analysis.confidence_score:.2f}, risk={ai_analysis.risk_assessment}")
-                except Exception as e:
-                    warning_msg = f"AI analysis failed: {str(e)}"
-                    error_details.append(warning_msg)
-                    logger.warning(f"[{job_id}] ⚠️ {warning_msg}")
-                    # AI failure doesn't stop processing
-            
-            # Phase 4: FHIR Mapping (if not validation-only)
-            if not upload_request.validate_only:
-                try:
-                    logger.info(f"[{job_id}] Phase 4: Production FHIR Mapping")
-                    fhir_mapping = await self._map_to_fhir_production(parsed_edi)
-                    job.fhir_mapping = fhir_mapping
-                    logger.info(f"[{job_id}] ✅ FHIR mapping completed: {len(fhir_mapping.resources)} resources")
-                except Exception as e:
-                    warning_msg = f"FHIR mapping failed: {str(e)}"
-                    error_details.append(warning_msg)
-                    logger.warning(f"[{job_id}] ⚠️ {warning_msg}")
-                    # FHIR failure doesn't stop processing if validation passed
-            
-            # Calculate processing time and determine final status
-            processing_time = time.time() - start_time
-            job.processing_time = processing_time
-            job.completed_at = datetime.utcnow()
-            
-            # Determine final status based on production criteria
-            if error_details:
-                # Has warnings but no critical failures
-                job.status = ProcessingStatus.COMPLETED
-                job.error_message = f"Completed with {len(error_details)} warning(s): " + "; ".join(error_details[:3])
-                logger.warning(f"[{job_id}] ⚠️ Processing completed with warnings")
-            else:
-                # Complete success
-                job.status = ProcessingStatus.COMPLETED
-                logger.info(f"[{job_id}] ✅ Processing completed successfully")
-            
-            # Update statistics
-            is_success = job.status == ProcessingStatus.COMPLETED
-            is_tr3_compliant = validation_result.tr3_compliance if validation_result else False
-            self._update_stats(success=is_success, tr3_compliant=is_tr3_compliant, processing_time=processing_time)
+                logger.info(f"[{job_id}] Phase 3: AI Analysis")
+                ai_analysis = await self._analyze_with_ai_production(parsed_edi, validation_result)
+                self._record_ai_analysis(job, ai_analysis, error_details)
             
-            logger.info(f"[{job_id}] Final status: {job.status.value}, TR3 compliant: {is_tr3_compliant}, Time: {processing_time:.2f}s")
+            # Phase 4 and final status
+            return await self._finish_job(job, upload_request, parsed_edi, validation_result, error_details, start_time)
             
-            return job
+        except Exception as e:
+            return self._system_error(job, e)
+
+    async def process_many(
+        self,
+        items: List[Tuple[str, EDIFileUpload]],
+        slots: Optional[asyncio.Semaphore] = None
+    ) -> List[ProcessingJob]:
+        """
+        Process several EDI documents, sharing batched AI requests across them.
+        
+        Every document goes through the same phases as process_content, but the AI-enhanced
+        validation and the AI analysis each run once for the whole set through the analyzer's
+        batch path instead of once per document.
+        
+        Args:
+            items: (content, upload_request) pairs
+            slots: Bounds how many documents are parsed, validated or mapped at once; share one
+                semaphore between callers to bound them together (default: no bound)
             
+        Returns:
+            List[ProcessingJob]: One job per item, in order
+        """
+        if slots is None:
+            slots = asyncio.Semaphore(max(1, len(items)))
+        started = [self._new_job(content, upload_request) for content, upload_request in items]
+        start_time = time.time()
+        error_details = [[] for _ in items]
+        
+        async def parse_and_validate(index: int) -> Optional[Tuple[ParsedEDI, ValidationResult]]:
+            (content, upload_request), (job, digest) = items[index], started[index]
+            try:
+                async with slots:
+                    parsed_edi = await self._parse_phase(job, content, upload_request, digest, error_details[index])
+                    if parsed_edi is None:
+                        return None
+                    try:
+                        logger.info(f"[{job.job_id}] Phase 2: Production TR3 Validation")
+                        validation_result = await self._validate_edi_production(
+                            parsed_edi, upload_request, digest, enhance=False
+                        )
+                    except Exception as e:
+                        self._fail_job(job, f"Production validation failed: {str(e)}", error_details[index])
+                        return None
+                return parsed_edi, validation_result
+            except Exception as e:
+                self._system_error(job, e)
+                return None
+        
+        staged = await asyncio.gather(*(parse_and_validate(index) for index in range(len(items))))
+        wants_ai = [index for index, stage in enumerate(staged) if stage is not None and items[index][1].enable_ai_analysis]
+        
+        # AI-enhanced validation for the whole set at once
+        if wants_ai and self.smart_validator:
+            async with self._ai_semaphore():
+                enhanced = await self.smart_validator.enhanced_validate_many([staged[index] for index in wants_ai])
+            for index, validation_result in zip(wants_ai, enhanced):
+                staged[index] = (staged[index][0], validation_result)
+        
+        for index, stage in enumerate(staged):
+            if stage is not None and not self._accept_validation(started[index][0], stage[1], error_details[index]):
+                staged[index] = None
+        
+        # AI analysis for the documents that passed validation, again as one batch
+        wants_ai = [index for index in wants_ai if staged[index] is not None]
+        if wants_ai and self.ai_analyzer.is_available:
+            analyses = await self._analyze_many_with_ai_production([staged[index] for index in wants_ai])
+            for index, ai_analysis in zip(wants_ai, analyses):
+                job = started[index][0]
+                logger.info(f"[{job.job_id}] Phase 3: AI Analysis")
+                self._record_ai_analysis(job, ai_analysis, error_details[index])
+        
+        async def finish(index: int) -> None:
+            job = started[index][0]
+            try:
+                async with slots:
+                    await self._finish_job(job, items[index][1], *staged[index], error_details[index], start_time)
+            except Exception as e:
+                self._system_error(job, e)
+        
+        await asyncio.gather(*(finish(index) for index, stage in enumerate(staged) if stage is not None))
+        return [job for job, _ in started]
+
+    def _new_job(self, content: str, upload_request: EDIFileUpload) -> Tuple[ProcessingJob, bytes]:
+        """Register a pending job for content; also returns the content digest used by the parse cache."""
+        job_id = str(uuid.uuid4())
+        encoded = content.encode('utf-8')
+        digest = blake2b(encoded, digest_size=16).digest()
+        job = ProcessingJob(
+            job_id=job_id,
+            filename=upload_request.filename,
+            status=ProcessingStatus.PENDING,
+            file_size=len(encoded)
+        )
+        del encoded
+        
+        self.jobs[job_id] = job
+        
+        logger.info(f"Starting production processing for job {job_id}")
+        job.status = ProcessingStatus.PROCESSING
+        job.started_at = datetime.utcnow()
+        return job, digest
+
+    def _fail_job(self, job: ProcessingJob, error_msg: str, error_details: List[str]) -> ProcessingJob:
+        """Mark job as failed with error_msg and count it in the statistics."""
+        error_details.append(error_msg)
+        logger.error(f"[{job.job_id}] ❌ {error_msg}")
+        job.error_message = error_msg
+        job.status = ProcessingStatus.FAILED
+        job.completed_at = datetime.utcnow()
+        self._update_stats(success=False, tr3_compliant=False)
+        return job
+
+    def _system_error(self, job: ProcessingJob, error: Exception) -> ProcessingJob:
+        """Mark job as failed after an unexpected error outside the phase handlers."""
+        logger.error(f"[{job.job_id}] ❌ Unexpected processing error: {str(error)}")
+        job.error_message = f"Processing system error: {str(error)}"
+        job.status = ProcessingStatus.FAILED
+        job.completed_at = datetime.utcnow()
+        self._update_stats(success=False, tr3_compliant=False)
+        return job
+
+    async def _parse_phase(self, job: ProcessingJob, content: str, upload_request: EDIFileUpload,
+                           digest: bytes, error_details: List[str]) -> Optional[ParsedEDI]:
+        """Phase 1: parse content onto the job; None (and a failed job) if parsing fails."""
+        try:
+            logger.info(f"[{job.job_id}] Phase 1: EDI Parsing")
+            parsed_edi = await self._parse_edi_content_production(content, upload_request.filename, digest)
+            job.parsed_edi = parsed_edi
+            logger.info(f"[{job.job_id}] ✅ Parsing successful: {len(parsed_edi.segments)} segments, method: {parsed_edi.parsing_method}")
+            return parsed_edi
+        except Exception as e:
+            self._fail_job(job, f"EDI parsing failed: {str(e)}", error_details)
+            return None
+
+    def _accept_validation(self, job: ProcessingJob, validation_result: ValidationResult,
+                           error_details: List[str]) -> bool:
+        """Record the validation on the job; False (and a failed job) if it has critical issues."""
+        job.validation_result = validation_result
+        
+        # Log validation results
+        critical_issues = [i for i in validation_result.issues if i.level == ValidationLevel.CRITICAL]
+        error_issues = [i for i in validation_result.issues if i.level == ValidationLevel.ERROR]
+        
+        logger.info(f"[{job.job_id}] Validation: Valid={validation_result.is_valid}, TR3={validation_result.tr3_compliance}")
+        logger.info(f"[{job.job_id}] Issues: {len(validation_result.issues)} total, {len(critical_issues)} critical, {len(error_issues)} errors")
+        
+        # Production rule: Fail processing if critical issues exist
+        if critical_issues:
+            self._fail_job(
+                job,
+                f"Production validation failed: {len(critical_issues)} critical TR3 compliance issues",
+                error_details
+            )
+            return False
+        return True
+
+    def _record_ai_analysis(self, job: ProcessingJob, ai_analysis: Optional[AIAnalysis],
+                            error_details: List[str]) -> None:
+        """Phase 3 result onto the job; a missing analysis is recorded as a warning."""
+        try:
+            job.ai_analysis = ai_analysis
+            logger.info(f"[{job.job_id}] ✅ AI analysis completed: confidence={ai_analysis.confidence_score:.2f}, risk={ai_analysis.risk_assessment}")
         except Exception as e:
-            logger.error(f"[{job_id}] ❌ Unexpected processing error: {str(e)}")
-            job.error_message = f"Processing system error: {str(e)}"
-            job.status = ProcessingStatus.FAILED
-            job.completed_at = datetime.utcnow()
-            self._update_stats(success=False, tr3_compliant=False)
-            return job
-
-    async def _parse_edi_content_production(self, content: str, filename: str) -> ParsedEDI:
+            warning_msg = f"AI analysis failed: {str(e)}"
+            error_details.append(warning_msg)
+            logger.warning(f"[{job.job_id}] ⚠️ {warning_msg}")
+            # AI failure doesn't stop processing
+
+    async def _finish_job(self, job: ProcessingJob, upload_request: EDIFileUpload, parsed_edi: ParsedEDI,
+                          validation_result: ValidationResult, error_details: List[str],
+                          start_time: float) -> ProcessingJob:
+        """Phase 4 (FHIR mapping) and the final status and statistics."""
+        job_id = job.job_id
+        
+        # Phase 4: FHIR Mapping (if not validation-only)
+        if not upload_request.validate_only:
+            try:
+                logger.info(f"[{job_id}] Phase 4: Production FHIR Mapping")
+                fhir_mapping = await self._map_to_fhir_production(parsed_edi)
+                job.fhir_mapping = fhir_mapping
+                logger.info(f"[{job_id}] ✅ FHIR mapping completed: {len(fhir_mapping.resources)} resources")
+            except Exception as e:
+                warning_msg = f"FHIR mapping failed: {str(e)}"
+                error_details.append(warning_msg)
+                logger.warning(f"[{job_id}] ⚠️ {warning_msg}")
+                # FHIR failure doesn't stop processing if validation passed
+        
+        # Calculate processing time and determine final status
+        processing_time = time.time() - start_time
+        job.processing_time = processing_time
+        job.completed_at = datetime.utcnow()
+        
+        # Determine final status based on production criteria
+        if error_details:
+            # Has warnings but no critical failures
+            job.status = ProcessingStatus.COMPLETED
+            job.error_message = f"Completed with {len(error_details)} warning(s): " + "; ".join(error_details[:3])
+            logger.warning(f"[{job_id}] ⚠️ Processing completed with warnings")
+        else:
+            # Complete success
+            job.status = ProcessingStatus.COMPLETED
+            logger.info(f"[{job_id}] ✅ Processing completed successfully")
+        
+        # Update statistics
+        is_success = job.status == ProcessingStatus.COMPLETED
+        is_tr3_compliant = validation_result.tr3_compliance if validation_result else False
+        self._update_stats(success=is_success, tr3_compliant=is_tr3_compliant, processing_time=processing_time)
+        
+        logger.info(f"[{job_id}] Final status: {job.status.value}, TR3 compliant: {is_tr3_compliant}, Time: {processing_time:.2f}s")
+        
+        return job
+
+    def _ai_semaphore(self) -> asyncio.Semaphore:
+        """Semaphore limiting concurrent AI calls on the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._ai_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._ai_semaphores[loop] = asyncio.Semaphore(settings.ai_concurrency_limit)
+        return semaphore
+
+    def _cached_parse(self, digest: Optional[bytes]) -> Optional[list]:
+        """Cache entry for previously parsed content with this digest, if any."""
+        if digest is None:
+            return None
+        with self._parse_cache_lock:
+            entry = self._parse_cache.get(digest)
+            if entry is not None:
+                self._parse_cache.move_to_end(digest)
+            return entry
+
+    def _store_parse(self, digest: bytes, parsed_edi: ParsedEDI) -> None:
+        """Cache a successful parse, evicting the least recently used entries; large documents are not cached."""
+        size = len(parsed_edi.raw_content)
+        if size > PARSE_CACHE_ENTRY_MAX_BYTES:
+            return
+        with self._parse_cache_lock:
+            previous = self._parse_cache.pop(digest, None)
+            if previous is not None:
+                self._parse_cache_bytes -= previous[2]
+            self._parse_cache[digest] = [parsed_edi, None, size]
+            self._parse_cache_bytes += size
+            while len(self._parse_cache) > PARSE_CACHE_SIZE or self._parse_cache_bytes > PARSE_CACHE_MAX_BYTES:
+                _, evicted = self._parse_cache.popitem(last=False)
+                self._parse_cache_bytes -= evicted[2]
+
+    async def _parse_edi_content_production(self, content: str, filename: str, digest: Optional[bytes] = None) -> ParsedEDI:
         """Production-grade EDI parsing with enhanced error handling."""
+        entry = self._cached_parse(digest)
+        if entry is not None:
+            logger.info(f"Reusing parse of identical content ({len(entry[0].segments)} segments)")
+            return entry[0]
+        
         try:
             # Run parsing in thread pool to avoid blocking
             loop = asyncio.get_event_loop()
@@ -230,27 +409,37 @@ class ProductionEDIProcessingService:
             if 'fallback' in parsed_edi.parsing_method.lower():
                 logger.warning("Using fallback parsing - consider improving EDI format for optimal processing")
             
+            if digest is not None:
+                self._store_parse(digest, parsed_edi)
             return parsed_edi
             
         except Exception as e:
             logger.error(f"Production EDI parsing failed: {str(e)}")
             raise EDIProcessingError(f"Failed to parse EDI content: {str(e)}")
 
-    async def _validate_edi_production(self, parsed_edi: ParsedEDI, upload_request: EDIFileUpload) -> ValidationResult:
-        """Production-grade validation with strict TR3 compliance."""
+    async def _validate_edi_production(self, parsed_edi: ParsedEDI, upload_request: EDIFileUpload,
+                                       digest: Optional[bytes] = None, enhance: bool = True) -> ValidationResult:
+        """Production-grade validation with strict TR3 compliance; enhance=False skips the AI step."""
         try:
-            # Use production TR3 validator for strict compliance
-            loop = asyncio.get_event_loop()
-            validation_result = await loop.run_in_executor(
-                None, self.production_validator.validate_strict_tr3_compliance, parsed_edi
-            )
+            entry = self._cached_parse(digest)
+            if entry is not None and entry[1] is not None:
+                validation_result = entry[1]
+            else:
+                # Use production TR3 validator for strict compliance
+                loop = asyncio.get_event_loop()
+                validation_result = await loop.run_in_executor(
+                    None, self.production_validator.validate_strict_tr3_compliance, parsed_edi
+                )
+                if entry is not None:
+                    entry[1] = validation_result
             
             # Enhance with AI if available and requested
-            if upload_request.enable_ai_analysis and self.smart_validator:
+            if enhance and upload_request.enable_ai_analysis and self.smart_validator:
                 try:
-                    enhanced_result = await self.smart_validator.enhanced_validate(
-                        parsed_edi, validation_result
-                    )
+                    async with self._ai_semaphore():
+                        enhanced_result = await self.smart_validator.enhanced_validate(
+                            parsed_edi, validation_result
+                        )
                     logger.debug("AI-enhanced validation completed")
                     return enhanced_result
                 except Exception as e:
@@ -270,7 +459,8 @@ class ProductionEDIProcessingService:
                 logger.info("AI analysis not available")
                 return None
             
-            ai_analysis = await self.ai_analyzer.analyze_edi(parsed_edi, validation_result)
+            async with self._ai_semaphore():
+                ai_analysis = await self.ai_analyzer.analyze_edi(parsed_edi, validation_result)
             
             # Validate AI analysis results
             if ai_analysis.confidence_score < 0.0 or ai_analysis.confidence_score > 1.0:
@@ -284,6 +474,29 @@ class ProductionEDIProcessingService:
             # Return None instead of raising - AI failure shouldn't stop processing
             return None
 
+    async def _analyze_many_with_ai_production(
+            self, items: List[Tuple[ParsedEDI, ValidationResult]]) -> List[Optional[AIAnalysis]]:
+        """_analyze_with_ai_production for several documents through the analyzer's batch path."""
+        try:
+            if not self.ai_analyzer.is_available:
+                logger.info("AI analysis not available")
+                return [None] * len(items)
+            
+            async with self._ai_semaphore():
+                analyses = await self.ai_analyzer.analyze_many(items)
+            
+            # Validate AI analysis results
+            for ai_analysis in analyses:
+                if ai_analysis.confidence_score < 0.0 or ai_analysis.confidence_score > 1.0:
+                    logger.warning(f"AI confidence score out of range: {ai_analysis.confidence_score}")
+                    ai_analysis.confidence_score = max(0.0, min(1.0, ai_analysis.confidence_score))
+            
+            return analyses
+            
+        except Exception as e:
+            logger.error(f"Production AI analysis failed: {str(e)}")
+            return [None] * len(items)
+
     async def _map_to_fhir_production(self, parsed_edi: ParsedEDI) -> FHIRMapping:
         """Production-grade FHIR mapping with comprehensive error handling."""
         try:
@@ -546,9 +759,19 @@ class ProductionEDIProcessingService:
         """Get job by ID."""
         return self.jobs.get(job_id)
 
-    def get_all_jobs(self) -> Dict[str, ProcessingJob]:
-        """Get all jobs."""
-        return self.jobs.copy()
+    def get_all_jobs(self) -> Mapping[str, ProcessingJob]:
+        """Get all jobs as a read-only view of the live job table (no copy)."""
+        return MappingProxyType(self.jobs)
+
+    def recent_jobs(self, limit: int, status: Optional[ProcessingStatus] = None) -> List[ProcessingJob]:
+        """
+        Newest jobs first, optionally only those with the given status.
+        
+        Jobs are added to self.jobs as they are created, so walking the dict backwards
+        yields them newest first and stops after limit matches instead of sorting every job.
+        """
+        matches = (job for job in reversed(self.jobs.values()) if status is None or job.status is status)
+        return list(islice(matches, max(limit, 0)))
 
     async def cleanup_old_jobs(self, max_age_hours: int = 24):
         """Clean up old jobs."""
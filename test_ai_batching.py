@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Tests for multi-document AI batching (EDIAIAnalyzer.analyze_many and EDIProcessingService.process_many)."""
+
+import asyncio
+import json
+
+from app.ai.analyzer import EDIAIAnalyzer, SmartEDIValidator, BATCH_PROMPT
+from app.core.edi_parser import EDI278Parser
+from app.core.models import EDIFileUpload, ValidationIssue, ValidationLevel, ValidationResult
+from app.services.processor import EDIProcessingService
+
+SAMPLE_EDI = """ISA*00*          *00*          *ZZ*SENDER_ID     *ZZ*RECEIVER_ID   *250620*1909*U*00501*000000001*0*P*>~GS*HS*SENDER_ID*RECEIVER_ID*20250620*1909*1*X*005010X217~ST*278*0001~BHT*0078*13*10001234*20250620*1909~HL*1**20*1~NM1*PR*2*INSURANCE COMPANY*****PI*12345~TRN*1*93175-012547*9877281234~HL*2*1*21*1~NM1*1P*1*SMITH*JOHN****SV*123456789~HL*3*2*22*0~TRN*2*93175-012547*9877281234~NM1*IL*1*DOE*JANE*A***MI*987654321~DMG*D8*19850101*F~SE*12*0001~GE*1*1~IEA*1*000000001~"""
+
+BATCH_MARKER = BATCH_PROMPT.split("{")[0]
+
+GOOD_ENTRY = {
+    "anomalies": ["Subscriber loop is missing a DMG segment"],
+    "patterns": {"quality": "medium", "structure": "ok", "confidence": 0.7},
+    "suggestions": ["Add the DMG segment to the subscriber loop"],
+    "risk": "medium"
+}
+
+
+class FakeGroqAnalyzer(EDIAIAnalyzer):
+    """Analyzer whose Groq calls are answered by a script instead of the API."""
+
+    def __init__(self, batch_reply):
+        super().__init__()
+        self.ai_available = True
+        self.batch_reply = batch_reply
+        self.prompts = []
+
+    async def _call_groq_api(self, prompt, max_tokens=None, stream=False, stop_on=None):
+        self.prompts.append(prompt)
+        if prompt.startswith(BATCH_MARKER):
+            count = prompt.count('"document_info"')
+            return self.batch_reply(count)
+        # Single-document combined analysis
+        return json.dumps(GOOD_ENTRY)
+
+    def batch_calls(self):
+        return sum(1 for prompt in self.prompts if prompt.startswith(BATCH_MARKER))
+
+
+def _documents(count):
+    """count (parsed_edi, validation_result) pairs that each carry an error, so AI is not skipped."""
+    parsed_edi = EDI278Parser().parse_content(SAMPLE_EDI, "sample.edi")
+    items = []
+    for index in range(count):
+        validation_result = ValidationResult(
+            is_valid=False,
+            issues=[ValidationIssue(level=ValidationLevel.ERROR, code=f"E{index}", message="Missing element")],
+            segments_validated=len(parsed_edi.segments)
+        )
+        items.append((parsed_edi, validation_result))
+    return items
+
+
+def test_one_groq_call_per_batch():
+    analyzer = FakeGroqAnalyzer(lambda count: json.dumps([GOOD_ENTRY] * count))
+    analyses = asyncio.run(analyzer.analyze_many(_documents(3)))
+
+    assert len(analyzer.prompts) == 1
+    assert analyzer.batch_calls() == 1
+    assert [a.anomalies_detected for a in analyses] == [GOOD_ENTRY["anomalies"]] * 3
+
+
+def test_batches_are_capped_at_batch_size():
+    from app.ai.analyzer import ANALYSIS_BATCH_SIZE
+
+    analyzer = FakeGroqAnalyzer(lambda count: json.dumps([GOOD_ENTRY] * count))
+    analyses = asyncio.run(analyzer.analyze_many(_documents(ANALYSIS_BATCH_SIZE + 1)))
+
+    assert analyzer.batch_calls() == 2
+    assert len(analyses) == ANALYSIS_BATCH_SIZE + 1
+
+
+def test_malformed_entry_falls_back_per_item():
+    def reply(count):
+        entries = [GOOD_ENTRY] * count
+        entries[1] = {"anomalies": "not a list"}
+        return json.dumps(entries)
+
+    analyzer = FakeGroqAnalyzer(reply)
+    analyses = asyncio.run(analyzer.analyze_many(_documents(3)))
+
+    # One batch call, plus one single-document call for the malformed entry only
+    assert analyzer.batch_calls() == 1
+    assert len(analyzer.prompts) == 2
+    assert all(a.anomalies_detected == GOOD_ENTRY["anomalies"] for a in analyses)
+
+
+def test_wrong_length_reply_falls_back_for_whole_batch():
+    analyzer = FakeGroqAnalyzer(lambda count: json.dumps([GOOD_ENTRY] * (count - 1)))
+    analyses = asyncio.run(analyzer.analyze_many(_documents(3)))
+
+    # The batch reply is discarded and every document is analyzed on its own
+    assert analyzer.batch_calls() == 1
+    assert len(analyzer.prompts) == 1 + 3
+    assert len(analyses) == 3
+
+
+def test_enhanced_validate_many_merges_each_analysis():
+    analyzer = FakeGroqAnalyzer(lambda count: json.dumps([GOOD_ENTRY] * count))
+    items = _documents(2)
+    enhanced = asyncio.run(SmartEDIValidator(analyzer).enhanced_validate_many(items))
+
+    assert analyzer.batch_calls() == 1
+    for (_, original), result in zip(items, enhanced):
+        assert result.issues[:len(original.issues)] == original.issues
+        assert result.issues[-1].code == "AI001"
+
+
+def test_malformed_issue_list_falls_back():
+    analyzer = FakeGroqAnalyzer(lambda count: json.dumps([GOOD_ENTRY] * count))
+    parsed_edi, _ = _documents(1)[0]
+    broken = ValidationResult.model_construct(is_valid=False, issues=None, segments_validated=1, tr3_compliance=False)
+    
+    # Neither path raises; the broken document gets the fallback analysis and no Groq call
+    single = asyncio.run(analyzer.analyze_edi(parsed_edi, broken))
+    batched = asyncio.run(analyzer.analyze_many([(parsed_edi, broken)] + _documents(1)))
+    
+    assert single.pattern_analysis["error"] == "analysis_unavailable"
+    assert batched[0].pattern_analysis["error"] == "analysis_unavailable"
+    assert batched[1].anomalies_detected == GOOD_ENTRY["anomalies"]
+    assert analyzer.batch_calls() == 1
+
+
+def test_process_many_batches_ai_across_documents():
+    service = EDIProcessingService()
+    analyzer = FakeGroqAnalyzer(lambda count: json.dumps([GOOD_ENTRY] * count))
+    service.ai_analyzer = analyzer
+    service.smart_validator = SmartEDIValidator(analyzer)
+
+    upload = EDIFileUpload(filename="sample.edi", enable_ai_analysis=True, validate_only=True)
+    contents = [
+        SAMPLE_EDI.replace("NM1*IL*1*DOE*JANE*A***MI*987654321", "NM1*IL*1"),  # error, no critical issues
+        SAMPLE_EDI.replace("BHT*0078*13*10001234*20250620*1909", "BHT*0078"),  # error, no critical issues
+        SAMPLE_EDI,  # clean: AI is skipped
+        "garbage"  # critical issues: AI-enhanced validation only, then the job fails
+    ]
+    jobs = asyncio.run(service.process_many([(content, upload) for content in contents]))
+
+    # One batched call for the enhanced validation and one for the analysis, none per document
+    assert analyzer.batch_calls() == 2
+    assert len(analyzer.prompts) == 2
+    assert [job.status.value for job in jobs] == ["completed", "completed", "completed", "failed"]
+    for job in jobs[:2]:
+        assert job.ai_analysis.anomalies_detected == GOOD_ENTRY["anomalies"]
+        assert job.validation_result.issues[-1].code == "AI001"
+    assert jobs[2].ai_analysis.pattern_analysis["analysis_type"] == "ai_skipped_happy_path"
+    assert all(service.jobs[job.job_id] is job for job in jobs)
+
+
+def test_process_many_respects_shared_slots():
+    service = EDIProcessingService()
+    upload = EDIFileUpload(filename="sample.edi", enable_ai_analysis=False, validate_only=True)
+    
+    async def run():
+        slots = asyncio.Semaphore(1)
+        active = peak = 0
+        parse_phase = service._parse_phase
+        
+        async def tracked_parse(*args):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0)
+            try:
+                return await parse_phase(*args)
+            finally:
+                active -= 1
+        
+        service._parse_phase = tracked_parse
+        jobs = await service.process_many([(SAMPLE_EDI, upload)] * 3, slots=slots)
+        return jobs, peak, slots.locked()
+    
+    jobs, peak, locked = asyncio.run(run())
+    assert peak == 1
+    assert not locked
+    assert [job.status.value for job in jobs] == ["completed"] * 3
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
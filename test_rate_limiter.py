@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Tests for the AI token-bucket rate limiter (app.ai._ratelimit.AsyncRateLimiter)."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest import mock
+
+from app.ai import _ratelimit
+from app.ai._ratelimit import AsyncRateLimiter
+
+
+class FakeClock:
+    """Stands in for time.monotonic and asyncio.sleep: sleeping advances the clock instantly."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _run(clock, coro_factory):
+    """Run coro_factory() with the limiter module reading time from clock."""
+    with mock.patch.object(_ratelimit, "time", SimpleNamespace(monotonic=clock.monotonic)), \
+            mock.patch.object(_ratelimit, "asyncio", SimpleNamespace(sleep=clock.sleep)):
+        return asyncio.run(coro_factory())
+
+
+def test_full_bucket_does_not_wait():
+    clock = FakeClock()
+    with mock.patch.object(_ratelimit, "time", SimpleNamespace(monotonic=clock.monotonic)):
+        limiter = AsyncRateLimiter(requests_per_minute=3, tokens_per_minute=600)
+
+    async def calls():
+        for _ in range(3):
+            await limiter.acquire(100)
+
+    _run(clock, calls)
+    assert clock.sleeps == []
+    assert limiter._requests == 0
+    assert limiter._tokens == 300
+
+
+def test_request_bucket_refills_over_time():
+    clock = FakeClock()
+    with mock.patch.object(_ratelimit, "time", SimpleNamespace(monotonic=clock.monotonic)):
+        limiter = AsyncRateLimiter(requests_per_minute=60, tokens_per_minute=6000)
+    limiter._requests = 0.0
+
+    _run(clock, lambda: limiter.acquire(1))
+
+    # One request per second refills; the call waits exactly that long
+    assert clock.sleeps == [1.0]
+    assert clock.now == 1001.0
+
+
+def test_token_bucket_refills_over_time():
+    clock = FakeClock()
+    with mock.patch.object(_ratelimit, "time", SimpleNamespace(monotonic=clock.monotonic)):
+        limiter = AsyncRateLimiter(requests_per_minute=60, tokens_per_minute=600)
+    limiter._tokens = 100.0
+
+    _run(clock, lambda: limiter.acquire(400))
+
+    # 300 missing tokens at 10 tokens/second
+    assert clock.sleeps == [30.0]
+    assert limiter._tokens == 0
+
+
+def test_refill_is_capped_at_bucket_size():
+    clock = FakeClock()
+    with mock.patch.object(_ratelimit, "time", SimpleNamespace(monotonic=clock.monotonic)):
+        limiter = AsyncRateLimiter(requests_per_minute=2, tokens_per_minute=600)
+    clock.now += 3600
+
+    async def calls():
+        await limiter.acquire(1)
+        await limiter.acquire(1)
+        await limiter.acquire(1)
+
+    _run(clock, calls)
+
+    # An idle hour refills no more than the two-request bucket holds
+    assert clock.sleeps == [30.0]
+
+
+def test_oversized_call_is_capped_to_bucket():
+    clock = FakeClock()
+    with mock.patch.object(_ratelimit, "time", SimpleNamespace(monotonic=clock.monotonic)):
+        limiter = AsyncRateLimiter(requests_per_minute=60, tokens_per_minute=600)
+
+    async def calls():
+        await limiter.acquire(5000)
+        await limiter.acquire(5000)
+
+    _run(clock, calls)
+
+    # Each call takes the whole bucket instead of waiting forever; the second waits one full refill
+    assert clock.sleeps == [60.0]
+    assert limiter._tokens == 0
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")